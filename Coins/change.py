@@ -0,0 +1,173 @@
+# make change for any amount from any set of coin denominations, with as few coins as possible
+
+from array import array
+from typing import Iterable, Optional
+
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    np = None # the table is built in pure Python instead - fine for small amounts, slow for millions
+
+
+US_COINS = (25, 10, 5, 1)
+UNREACHABLE = 1 << 30 # table entry for an amount no combination of coins adds up to
+
+_systems = {} # denominations -> CoinSystem, shared by every caller in the process
+
+
+class CoinSystem:
+    """
+    A set of coin denominations, and the fewest coins that make up any amount from them.
+
+    Greedy (as many of the biggest coin as fit, then the next...) is only optimal for canonical systems like US coins -
+    with coins of 4, 3 and 1, greedy pays 6 as 4 + 1 + 1 rather than 3 + 3. Whether a system is canonical is settled up front
+    with Pearson's O(n^3) test, and non-canonical systems fall back to a dynamic-programming table of the fewest coins for
+    every amount. The table is built on first use, kept, and extended (doubling in size) when a bigger amount is asked for.
+
+    Args:
+        denominations: the coin values, as positive ints in any order
+    """
+    def __init__(self, denominations: Iterable[int]) -> None:
+        self.denominations = tuple(sorted(set(denominations), reverse=True))
+        if not self.denominations or any(not isinstance(c, int) or c < 1 for c in self.denominations):
+            raise ValueError("denominations should be given as positive ints")
+        self.smallest_counterexample = self._find_counterexample()
+        self.canonical = self.smallest_counterexample is None
+        self._table = array("i") # amount -> fewest coins, or UNREACHABLE
+
+
+    def _greedy(self, amount: int) -> array:
+        """ Coins per denomination paid out greedily - which may fall short of `amount` without a 1 coin """
+        counts = array("Q", [0]) * len(self.denominations)
+        for i, coin in enumerate(self.denominations):
+            counts[i], amount = divmod(amount, coin)
+        return counts
+
+
+    def _find_counterexample(self) -> Optional[int]:
+        """
+        The smallest amount greedy pays with more coins than it needs, or None if the system is canonical (Pearson, "A
+        Polynomial-time Algorithm for the Change-Making Problem"). Every minimal counterexample is the greedy way to pay one
+        less than some coin, cut off after a smaller coin and topped up with one more of it - so only n^2 amounts are tried.
+        Without a 1 coin greedy can miss amounts entirely, so such systems never count as canonical (1 is returned).
+        """
+        coins = self.denominations
+        if coins[-1] != 1:
+            return 1
+        smallest = None
+        for i in range(1, len(coins)):
+            below = self._greedy(coins[i - 1] - 1)
+            for j in range(i, len(coins)):
+                counts = list(below[:j]) + [below[j] + 1]
+                amount = sum(count * coin for count, coin in zip(counts, coins))
+                if sum(self._greedy(amount)) > sum(counts) and (smallest is None or amount < smallest):
+                    smallest = amount
+        return smallest
+
+
+    def _extend(self, size: int) -> None:
+        """
+        Grow the table to cover amounts below `size`. Each coin is one pass over the new amounts, and with NumPy a pass is
+        a running minimum down every residue class mod the coin: fewest(a) = k + min over j <= k of (fewest(a - j*coin) - j),
+        for the k steps back to the previous table. The amounts the table already has are final, so they only seed the passes.
+        """
+        old = len(self._table)
+        if np is None:
+            table = self._table
+            for amount in range(old, size):
+                fewest = UNREACHABLE if amount else 0
+                for coin in self.denominations:
+                    if coin <= amount and table[amount - coin] + 1 < fewest:
+                        fewest = table[amount - coin] + 1
+                table.append(fewest)
+            return
+
+        table = np.full(size, UNREACHABLE, dtype=np.int64)
+        table[:old] = np.frombuffer(self._table, dtype=np.int32)
+        if old == 0:
+            table[0] = 0
+        for coin in self.denominations:
+            start = max(old - coin, 0) # the last row of old amounts seeds every residue class
+            pass_ = table[start:]
+            rows = -(-len(pass_) // coin)
+            grid = np.full(rows * coin, UNREACHABLE, dtype=np.int64)
+            grid[:len(pass_)] = pass_
+            steps = np.arange(rows, dtype=np.int64)[:, None]
+            grid = np.minimum.accumulate(grid.reshape(rows, coin) - steps, axis=0) + steps
+            np.minimum(pass_, grid.ravel()[:len(pass_)], out=pass_)
+        np.minimum(table, UNREACHABLE, out=table)
+        self._table = array("i", table.astype(np.int32).tobytes())
+
+
+    def coins_needed(self, amount: int) -> Optional[int]:
+        """
+        The fewest coins that add up to `amount`.
+
+        Args:
+            amount: the amount of change to make, in the smallest unit (e.g. $1.25 = 125)
+
+        Returns:
+            The number of coins, or None if no combination of the denominations adds up to `amount`
+        """
+        if amount < 0:
+            raise ValueError("amount should be given as a non-negative int")
+        if self.canonical:
+            return sum(self._greedy(amount))
+        if amount >= len(self._table):
+            self._extend(max(amount + 1, 2 * len(self._table), 1024))
+        fewest = self._table[amount]
+        return None if fewest >= UNREACHABLE else fewest
+
+
+    def change(self, amount: int) -> Optional[array]:
+        """
+        Make change for `amount` with as few coins as possible.
+
+        Args:
+            amount: the amount of change to make, in the smallest unit (e.g. $1.25 = 125)
+
+        Returns:
+            An array of coin counts lined up with `self.denominations` (biggest first), e.g. 32 in US coins = array("Q", [1, 0, 1, 2]),
+            or None if no combination of the denominations adds up to `amount`. The counts are unsigned 64-bit on every
+            platform, so amounts needing 2^64 or more of one coin raise OverflowError
+        """
+        fewest = self.coins_needed(amount)
+        if fewest is None:
+            return None
+        if self.canonical:
+            return self._greedy(amount)
+
+        # walk back down the table: on any fewest-coins path, taking k of a coin is optimal for every k up to some most, so
+        # each coin's count is found with a galloping search - and once a coin is exhausted, no optimal remainder uses it
+        table = self._table
+        counts = array("Q", [0]) * len(self.denominations)
+        for i, coin in enumerate(self.denominations):
+            fits = lambda k: k * coin <= amount and table[amount - k * coin] == fewest - k
+            low, high = 0, 1
+            while fits(high):
+                low, high = high, high * 2
+            while high - low > 1:
+                middle = (low + high) // 2
+                low, high = (middle, high) if fits(middle) else (low, middle)
+            counts[i] = low
+            amount -= low * coin
+            fewest -= low
+        return counts
+
+
+def coin_system(denominations: Iterable[int] = US_COINS) -> CoinSystem:
+    """ The CoinSystem for `denominations`, created the first time it's asked for and shared after that (with its table) """
+    key = tuple(sorted(set(denominations), reverse=True))
+    if key not in _systems:
+        _systems[key] = CoinSystem(key)
+    return _systems[key]
+
+
+def make_change(amount: int, denominations: Iterable[int] = US_COINS) -> Optional[array]:
+    """
+    Make change for `amount` with as few coins of `denominations` as possible - see CoinSystem.change.
+
+    Returns:
+        An array of coin counts lined up with the denominations sorted biggest first, or None if the amount can't be made
+    """
+    return coin_system(denominations).change(amount)
@@ -3,6 +3,8 @@
 from collections import OrderedDict
 from textwrap import dedent
 
+from change import US_COINS, make_change
+
 
 def tend_coins(amount: int) -> OrderedDict[int, int]:
     """
@@ -21,17 +23,11 @@ def tend_coins(amount: int) -> OrderedDict[int, int]:
     if amount < 1 or amount > 99:
         raise ValueError("amount should be given as an int of cents between 1-99")
     
-    quarters, amount = divmod(amount, 25)
-    dimes, amount = divmod(amount, 10)
-    nickels, pennies = divmod(amount, 5)
+    # US coins are a canonical system, so the change engine pays them out greedily - see change.py for any other coins
+    counts = make_change(amount, US_COINS)
     
     # only include a coin value if at least 1 will be given back
-    coins = OrderedDict()
-    if quarters > 0: coins[25] = quarters
-    if dimes > 0: coins[10] = dimes
-    if nickels > 0: coins[5] = nickels
-    if pennies > 0: coins[1] = pennies
-    return coins
+    return OrderedDict((coin, count) for coin, count in zip(US_COINS, counts) if count > 0)
 
 
 if __name__ == "__main__":
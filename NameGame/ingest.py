@@ -0,0 +1,170 @@
+"""
+Seed the CPU's name bank from big external name lists.
+The input files are split into byte ranges on line boundaries and normalized in parallel: whitespace collapsed, lowercased,
+suffixes (Jr., III, ...) stripped, and single-word names rejected. Each chunk is written out as a sorted run, and the runs are
+merged and deduped into a sorted, title-cased bank file - the names.txt format, with each letter's names together - so
+memory stays bounded by the chunk size however many lines there are. The names already in the bank file are merged in as
+they are.
+"""
+import argparse
+import heapq
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from journal import NameStore
+from namegame import NO_PERIODS, SUFFIXES
+
+
+def normalize(line):
+    """ The lowercase :line: with its whitespace collapsed and its suffixes dropped, or None if that leaves fewer than two words """
+    # most parts have no periods to take out, and skipping the translate for them halves the time per line
+    parts = [p for p in line.lower().split() if p not in SUFFIXES and ("." not in p or p.translate(NO_PERIODS) not in SUFFIXES)]
+    return " ".join(parts) if len(parts) > 1 else None
+
+
+def _split(paths, chunk_bytes):
+    """ Yield (path, start, end) byte ranges of about :chunk_bytes: covering :paths:, each ending on a line boundary """
+    for path in paths:
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            start = 0
+            while start < size:
+                f.seek(min(start + chunk_bytes, size))
+                f.readline() # on to the end of the line the range would have cut
+                end = f.tell()
+                yield path, start, end
+                start = end
+
+
+def _ingest_chunk(args):
+    """ Worker entry point - normalize one byte range and write its distinct names to a sorted run file in :run_dir: """
+    path, start, end, run_dir = args
+    with open(path, "rb") as f:
+        f.seek(start)
+        lines = f.read(end - start).decode("utf-8", errors="replace").splitlines()
+
+    counts = Counter(lines=len(lines))
+    names = set()
+    for line in lines:
+        name = normalize(line)
+        if name is not None:
+            names.add(name)
+            counts["accepted"] += 1
+        elif line.strip():
+            counts["single word"] += 1
+        else:
+            counts["blank"] += 1
+
+    fd, run = tempfile.mkstemp(suffix=".run", dir=run_dir)
+    with open(fd, "w", encoding="utf-8") as f:
+        f.writelines(name + "\n" for name in sorted(names))
+    return run, counts
+
+
+def _bank_run(path, run_dir):
+    """
+    Write the names already in the bank file at :path: to a sorted run file in :run_dir:, as they are - lowercased to match
+    the other runs, but not renormalized. Returns (run, number of distinct names). A bank file is written sorted, so it's
+    streamed, unless it's been edited out of order, when it's sorted in memory instead.
+    """
+    fd, run = tempfile.mkstemp(suffix=".run", dir=run_dir)
+    with open(path, "r", encoding="utf-8") as f, open(fd, "w", encoding="utf-8") as out:
+        kept, last = 0, ""
+        for line in f:
+            name = line.strip().lower()
+            if name == "" or name == last:
+                continue
+            if name < last:
+                break
+            out.write(name + "\n")
+            kept, last = kept + 1, name
+        else:
+            return run, kept
+
+    with open(path, "r", encoding="utf-8") as f:
+        names = sorted(set(line.strip().lower() for line in f) - {""})
+    with open(run, "w", encoding="utf-8") as out:
+        out.writelines(name + "\n" for name in names)
+    return run, len(names)
+
+
+def _merge(runs, out, transform=str):
+    """ Write the distinct lines of the sorted :runs: to the file :out:, in order, through :transform:. Returns the number written. """
+    files = [open(run, "r", encoding="utf-8") for run in runs]
+    try:
+        written, last = 0, None
+        for line in heapq.merge(*files):
+            if line != last:
+                out.write(transform(line))
+                written += 1
+                last = line
+        return written
+    finally:
+        for f in files:
+            f.close()
+
+
+def ingest(paths, output="names.txt", replace=False, workers=None, chunk_bytes=8 << 20, fan_in=256):
+    """
+    Normalize the names in the files at :paths: across :workers: processes and write them, sorted and deduped, to the bank
+    file :output:. Unless :replace: is set, the names already in :output: are kept as they are - merged in as one more sorted
+    run, without renormalizing them or counting them as input lines. Runs are merged at most :fan_in: at a time, to stay
+    under the open file limit.
+    Returns a Counter of the lines read, names written (of which "kept" were already in :output:), and lines rejected as
+    "blank", "single word" or "duplicate".
+    """
+    workers = workers or os.cpu_count() or 1
+    store = NameStore(output)
+    with store.lock_compactions(), tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(output))) as run_dir:
+        runs, counts = [], Counter()
+        if not replace and os.path.exists(output):
+            run, counts["kept"] = _bank_run(output, run_dir)
+            runs.append(run)
+        chunks = [(path, start, end, run_dir) for path, start, end in _split(paths, chunk_bytes)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for run, chunk_counts in pool.map(_ingest_chunk, chunks):
+                runs.append(run)
+                counts.update(chunk_counts)
+
+        while len(runs) > fan_in:
+            merged = []
+            for i in range(0, len(runs), fan_in):
+                fd, run = tempfile.mkstemp(suffix=".run", dir=run_dir)
+                with open(fd, "w", encoding="utf-8") as out:
+                    _merge(runs[i:i + fan_in], out)
+                merged.append(run)
+            runs = merged
+
+        temporary = output + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as out:
+            counts["written"] = _merge(runs, out, transform=str.title)
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(temporary, output)
+
+    counts["duplicate"] = counts.pop("accepted", 0) - (counts["written"] - counts["kept"])
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Normalize, dedupe and merge name lists (one name per line) into a Name Game bank file.")
+    parser.add_argument("files", nargs="+", help="name lists to ingest")
+    parser.add_argument("-o", "--output", default="names.txt", help="bank file to write (default: names.txt)")
+    parser.add_argument("--replace", action="store_true", help="replace the names already in the output file instead of keeping them")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="number of worker processes (default: cpu count)")
+    parser.add_argument("--chunk-mb", type=float, default=8, help="megabytes of input per task sent to a worker")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = ingest(args.files, output=args.output, replace=args.replace, workers=args.workers, chunk_bytes=int(args.chunk_mb * (1 << 20)))
+    elapsed = time.perf_counter() - start
+    print(
+        f"Ingested {counts['lines']:,} lines in {elapsed:.2f}s ({counts['lines'] / elapsed:,.0f} lines/s) - wrote {counts['written']:,} names "
+        f"({counts['kept']:,} already there) to {args.output}, "
+        f"rejected {counts['blank']:,} blank, {counts['single word']:,} single-word and {counts['duplicate']:,} duplicate lines",
+        file=sys.stderr,
+    )
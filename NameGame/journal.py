@@ -0,0 +1,167 @@
+"""
+An append-only store for the names the CPU learns.
+The bank is a sorted base file (names.txt) plus a journal of the names learned since it was last compacted. A game only
+appends the names it learned to the journal, so saving costs the names played rather than the size of the bank, and
+concurrent games never overwrite each other. Once the journal grows past a fraction of the base, it's merged into a new
+sorted base in a background thread - or run `python journal.py` to compact it by hand.
+"""
+import os
+import sys
+import threading
+
+try:
+    import fcntl
+except ImportError: # no advisory locks (Windows) - appends are still atomic, but don't compact while games are running
+    fcntl = None
+
+
+class NameStore():
+    """
+    The names in the base file at :path: and its journal at :path:.journal, one per line in title case.
+    :compact_ratio: is how big the journal may get, as a fraction of the base file's size, before compact_soon compacts it.
+    Appends hold a shared lock on :path:.lock and compaction takes an exclusive one to move the journal aside, so it never
+    loses an append that was in flight. Compactions queue up on :path:.compact.lock.
+    """
+    def __init__(self, path="names.txt", compact_ratio=0.5):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.lock_path = path + ".lock"
+        self.compact_lock_path = path + ".compact.lock"
+        self.compact_ratio = compact_ratio
+        self._compactor = None
+
+
+    def names(self):
+        """
+        Yield every stored name (stripped, in the case it was written), duplicates and all.
+        The files are opened newest first - the journal, one being compacted, then the base - so that a compaction running
+        meanwhile can't hide any names - it only ever moves them from an older file into a newer one.
+        """
+        files = []
+        try:
+            for path in (self.journal_path, self.journal_path + ".compacting", self.path):
+                try:
+                    files.append(open(path, "r"))
+                except FileNotFoundError:
+                    pass
+            for f in files:
+                for name in f:
+                    name = name.strip()
+                    if name != "":
+                        yield name
+        finally:
+            for f in files:
+                f.close()
+
+
+    def append(self, names):
+        """ Add :names: to the journal in a single write, so concurrent appends never interleave """
+        data = "".join(name.strip().title() + "\n" for name in names if name.strip()).encode()
+        if not data:
+            return
+        with _FileLock(self.lock_path, exclusive=False):
+            fd = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                written = os.write(fd, data)
+                while written < len(data): # only short on a full disk or a signal - the rest still lands in order
+                    written += os.write(fd, data[written:])
+            finally:
+                os.close(fd)
+
+
+    def compact(self):
+        """
+        Merge the journal into the base file: sort and dedupe (ignoring case) every name, write them to a temporary file, and
+        swap it in for the base. The journal is moved aside first, so games can go on appending to a fresh one meanwhile.
+        Returns the number of names in the new base file.
+        """
+        with self.lock_compactions():
+            return self._compact()
+
+
+    def _compact(self):
+        """ compact, once the compaction lock is held """
+        compacting = self.journal_path + ".compacting"
+        with _FileLock(self.lock_path, exclusive=True):
+            if not os.path.exists(compacting): # a compaction that died part way leaves its journal to be merged again
+                try:
+                    os.replace(self.journal_path, compacting)
+                except FileNotFoundError:
+                    return None # nothing to merge
+
+        names = {}
+        for path in (self.path, compacting):
+            try:
+                with open(path, "r") as f:
+                    for name in f:
+                        name = name.strip()
+                        if name != "":
+                            names.setdefault(name.lower(), name.title())
+            except FileNotFoundError:
+                pass
+
+        temporary = self.path + ".tmp"
+        with open(temporary, "w") as f:
+            f.writelines(names[key] + "\n" for key in sorted(names))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.path)
+        os.remove(compacting)
+        return len(names)
+
+
+    def lock_compactions(self):
+        """ A context manager that holds off compactions - for replacing the base file some other way """
+        return _FileLock(self.compact_lock_path, exclusive=True)
+
+
+    def needs_compaction(self):
+        """ Whether the journal has outgrown :compact_ratio: of the base file """
+        try:
+            journal = os.path.getsize(self.journal_path)
+        except FileNotFoundError:
+            return False
+        try:
+            base = os.path.getsize(self.path)
+        except FileNotFoundError:
+            base = 0
+        return journal > self.compact_ratio * base
+
+
+    def compact_soon(self):
+        """ Compact in a background thread if the journal needs it - the interpreter waits for the thread before exiting """
+        if self.needs_compaction() and (self._compactor is None or not self._compactor.is_alive()):
+            self._compactor = threading.Thread(target=self.compact, name="names-compactor")
+            self._compactor.start()
+        return self._compactor
+
+
+class _FileLock():
+    """ An advisory flock on :path:, for the duration of a with block (a no-op without fcntl) """
+    def __init__(self, path, exclusive):
+        self.path = path
+        self.exclusive = exclusive
+        self._fd = None
+
+
+    def __enter__(self):
+        if fcntl is not None:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._fd, fcntl.LOCK_EX if self.exclusive else fcntl.LOCK_SH)
+        return self
+
+
+    def __exit__(self, *exc):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+if __name__ == "__main__":
+    store = NameStore(sys.argv[1] if len(sys.argv) > 1 else "names.txt")
+    count = store.compact()
+    if count is None:
+        print(f"Nothing to compact - {store.journal_path} is empty", file=sys.stderr)
+    else:
+        print(f"Compacted {store.journal_path} into {store.path} ({count:,} names)", file=sys.stderr)
@@ -0,0 +1,118 @@
+""" The CPU's name bank, indexed so that every per-turn operation takes constant time however many names it holds. """
+import random
+
+
+class NameBank():
+    """
+    Names (stored in lowercase) grouped by the first letter of the first name.
+    Each letter's names sit in a dense list, with a position map from name to index in it - so a random choice is one index
+    and a removal swaps the last name of the list into the removed one's slot. The first letter of each name's last name is
+    parsed once, with :parse_last_name:, when the name is added.
+    """
+    def __init__(self, names=(), parse_last_name=None):
+        self.parse_last_name = parse_last_name
+        self._names = {} # letter -> list of names
+        self._position = {} # name -> index in its letter's list
+        self._last = {} # name -> first letter of its last name, kept after the name is removed
+        for name in names:
+            self.add(name)
+
+
+    def __len__(self):
+        return len(self._position)
+
+
+    def __contains__(self, name):
+        return name.lower() in self._position
+
+
+    def __iter__(self):
+        return iter(self._position)
+
+
+    def add(self, name):
+        """ Add :name: to the bank, if it isn't there already """
+        name = name.lower()
+        if name in self._position:
+            return
+        names = self._names.setdefault(name[0], [])
+        self._position[name] = len(names)
+        names.append(name)
+        if name not in self._last:
+            self._last[name] = self.parse_last_name(name)
+
+
+    def remove(self, name):
+        """ Take :name: out of the bank, returning the index it had in its letter's list - names that aren't in it are ignored """
+        name = name.lower()
+        i = self._position.pop(name, None)
+        if i is None:
+            return None
+        names = self._names[name[0]]
+        moved = names.pop()
+        if moved != name:
+            names[i] = moved
+            self._position[moved] = i
+        return i
+
+
+    def put_back(self, name, i):
+        """
+        Undo remove(:name:), which returned :i:, by swapping it back into place. Removals undone in reverse order leave the
+        bank exactly as it was - lists in the same order - so a seeded game can be replayed on it.
+        """
+        name = name.lower()
+        names = self._names[name[0]]
+        if i < len(names):
+            moved = names[i]
+            names.append(moved)
+            self._position[moved] = len(names) - 1
+            names[i] = name
+        else:
+            names.append(name)
+        self._position[name] = i
+
+
+    def seen(self, name):
+        """ Whether :name: is, or ever was, in the bank """
+        return name.lower() in self._last
+
+
+    def choice(self, letter, rnd=random, exclude=None):
+        """
+        A random name starting with :letter:, or None if there isn't one left.
+        Names in the :exclude: set are never chosen - so many games can share one bank, each with its own small set of played
+        names. A few random picks almost always miss the set; if they don't, the letter's names are scanned from a random
+        starting point.
+        """
+        names = self._names.get(letter.lower())
+        if not names:
+            return None
+        if not exclude:
+            return names[rnd.randrange(len(names))]
+        for _ in range(8):
+            name = names[rnd.randrange(len(names))]
+            if name not in exclude:
+                return name
+        start = rnd.randrange(len(names))
+        for i in range(len(names)):
+            name = names[(start + i) % len(names)]
+            if name not in exclude:
+                return name
+        return None
+
+
+    def letters(self):
+        """ The letters that still have names """
+        return [letter for letter, names in self._names.items() if names]
+
+
+    def names(self, letter):
+        """ The names left starting with :letter: (in no particular order) """
+        return self._names.get(letter.lower(), [])
+
+
+    def last_initial(self, name):
+        """ The first letter of :name:'s last name - pre-parsed for any name that's been in the bank """
+        last = self._last.get(name.lower())
+        return last if last is not None else self.parse_last_name(name)
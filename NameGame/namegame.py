@@ -1,13 +1,32 @@
 import random
 import re
 import time
-from collections import defaultdict
+
+from journal import NameStore
+from name_bank import NameBank
+from strategy import SearchStrategy
+
+
+SUFFIXES = frozenset("sr, jr, i, ii, iii, iv, v, vi, vii, viii, vix, ix, x, ".split(", ")) # Sr., Jr., and roman numerals 1-10 - lowercase, without periods
+NO_PERIODS = str.maketrans("", "", ".")
 
 
 class NameGame():
-    def __init__(self):
+    def __init__(self, strategy="search", budget=0.2):
+        """
+        :strategy="search": (default) the CPU searches the game tree for the name that leaves you stuck, for up to :budget: seconds a move
+        :strategy="random": the CPU plays any name it knows for the letter
+        """
+        self.store = NameStore(self.__file__) # names.txt, plus a journal of the names learned since it was compacted
         self.name_bank = self._parse_names() # word bank for the CPU player - stored in lowercase
-        self.played = [] # names already played - stored in lowercase
+        self.played = [] # names already played, in order - stored in lowercase
+        self.played_set = set() # the same names, for the repeat check
+        if strategy == "search":
+            self.strategy = SearchStrategy(self.name_bank, self.name_bank.last_initial, budget=budget)
+        elif strategy == "random":
+            self.strategy = None
+        else:
+            raise ValueError(f"unknown strategy {strategy!r}")
 
 
     @property
@@ -43,8 +62,8 @@ class NameGame():
     def __str__(self):
         """ Print an alphabetical ordering of the names in the name_bank along with the names played. """
         string = "\nRemaining Name Bank:\n"
-        for k, v in sorted(list(self.name_bank.items())):
-            names = [n.title() for n in sorted(v)]
+        for k in sorted(self.name_bank.letters()):
+            names = [n.title() for n in sorted(self.name_bank.names(k))]
             if len(names) > 0:
                 string += f"{k.upper()} - {', '.join(names)}\n"
 
@@ -56,77 +75,58 @@ class NameGame():
 
 
     def _parse_names(self):
-        """ Internal method - Read in the names.txt file and parse them to a defaultdict, where the keys are the beginning letter of the first names. """
-        name_bank = defaultdict(set)
-        with open(self.__file__, "r") as f:
-            for name in f.readlines():
-                name = name.strip().lower()
-                if name != "":
-                    letter = name[0]
-                    name_bank[letter].add(name)
-           
-        return name_bank
+        """ Internal method - Read in the stored names (names.txt and its journal) and index them in a NameBank, by the beginning letter of the first names. """
+        return NameBank((name.lower() for name in self.store.names()), parse_last_name=self.parse_last_name)
 
 
     def _store_names(self):
         """ 
         Internal method - Learn from the player.
-        Once the game is over, write the self.played names to the __file__, so the CPU can usDe them next time.
+        Once the game is over, append the self.played names the CPU didn't know to the store's journal, so the CPU can use them next time.
+        The journal is merged into the __file__ in the background once it grows big enough.
         """
-        # seed with the names from the file, add the played names, dedupe, sort, and write to file
-        with open(self.__file__, "r") as f:
-            names =  f.readlines()
-
-        names.extend(self.played)
-        names = [n.lower().replace("\n", "") for n in names]
-        names = sorted(list(set(names)))
-
-        with open(self.__file__, "w") as f:
-            for n in names:
-                f.write(n.title()+"\n")
+        self.store.append(name for name in self.played if not self.name_bank.seen(name))
+        self.store.compact_soon()
         
         return 
     
 
     def _remove_from_bank(self, name):
         """ Internal method - Take the given :name: and remove it from self.name_bank """ 
-        name = name.lower()
-        letter = name[0] 
-        if name in self.name_bank[letter]:
-            self.name_bank[letter].remove(name.lower())
+        self.name_bank.remove(name)
+        if self.strategy is not None:
+            self.strategy.remove(name)
 
 
     def _choose_random_name(self, letter, remove=True):
         """ Internal method - Choose a random name from the self.name_bank (and by defualt, :remove: it) for the given :letter: """        
-        letter = letter.lower()
-        names = list(self.name_bank[letter])
-        if len(names) > 0:
-            choice = random.choice(names)
-            if remove:
-                self._remove_from_bank(choice)
-        else:
-            choice = None       
+        choice = self.name_bank.choice(letter)
+        if choice is not None and remove:
+            self._remove_from_bank(choice)
     
         return choice
 
 
+    def _choose_name(self, letter):
+        """ Internal method - Choose (and remove) the CPU's name for the given :letter:, with the game's strategy """
+        if self.strategy is None:
+            return self._choose_random_name(letter)
+        choice = self.strategy.choose(letter)
+        if choice is not None:
+            self._remove_from_bank(choice)
+        return choice
+
+
+    def _mark_played(self, name):
+        """ Internal method - Record :name: as played """
+        self.played.append(name.lower())
+        self.played_set.add(name.lower())
+
+
     def _trim_postfix(self, name):
         """ Given a fullname :name:, parse out the common suffixes (Sr., Jr., III, etc.). Returns a name string. """
-        
-        def _is_suffix(part):
-            """ Determine if the given name :part: is a postfix. Returns a bool. """
-            # sub out all periods - as seen in "Sr."
-            # compare against Sr., Jr., and roman numerals 1-10
-            part = part.replace(".", "")
-            # part = re.sub(r"[^\w]", "", part) # could break hyphens
-            if part.lower() in ["sr", "jr"] or \
-                part.upper() in "I, II, III, IV, V, VI, VII, VIII, VIX, IX, X".split(", ") or \
-                part == "":
-                return True
-            else:
-                return False
-
-        parts = [p for p in name.split(" ") if not _is_suffix(p)]
+        # sub out all periods - as seen in "Sr." (only parts with one need it) - and compare against SUFFIXES; empty parts (from extra spaces) go too
+        parts = [p for p in name.split(" ") if p.lower() not in SUFFIXES and ("." not in p or p.translate(NO_PERIODS).lower() not in SUFFIXES)]
         return " ".join(parts)
 
 
@@ -136,6 +136,28 @@ class NameGame():
         return name.split(" ")[-1][0]
 
 
+    def check_name(self, name, letter=None, played=None):
+        """
+        Validate the (stripped, single-spaced) :name: as the next move: it needs 2+ non-suffix words, must start with :letter:
+        (if one is specified), and can't be in the :played: set of lowercase names (self.played_set by default).
+        Returns the problem as a message string, or None if the name is fine.
+        """
+        played = self.played_set if played is None else played
+
+        # name should contain 2+, non-suffix words
+        if " " not in self._trim_postfix(name):
+            return "Name must contain two or more words."
+        
+        # if a letter is specified, check that the given name starts with it
+        if letter is not None and name[0].lower() != letter.lower():
+            return f"Name must start with the letter {letter.upper()}."
+
+        # name can't have been played previously
+        if name.lower() in played:
+            return "Name was already played. Try another."
+        return None
+
+
     def get_name_input(self, letter=None):
         """ Get input from the user and validate it before returning. """
         name = None
@@ -149,21 +171,9 @@ class NameGame():
                 if name.lower() in "q, quit, stop, exit".split(", "):
                     return None
                 
-                # name should contain 2+, non-suffix words
-                if " " not in self._trim_postfix(name):
-                    print("!! Name must contain two or more words.")
-                    name = None
-                    continue
-                
-                # if a letter is specified, check that the given name starts with it
-                if letter is not None and name[0].lower() != letter.lower():
-                    print(f"!! Name must start with the letter {letter.upper()}.")
-                    name = None
-                    continue
-
-                # name can't have been played previously
-                if name.lower() in [p.lower() for p in self.played]:
-                    print("!! Name was already played. Try another.")
+                problem = self.check_name(name, letter)
+                if problem is not None:
+                    print(f"!! {problem}")
                     name = None
                     continue
         except KeyboardInterrupt:
@@ -179,19 +189,20 @@ class NameGame():
         :players=0: (or less than 1): the computer will play itself
         :players=1: play against the computer
         """
-        letter = random.choice(list(self.name_bank))
+        letter = random.choice(self.name_bank.letters())
         if players < 1:
             while True:
-                name = self._choose_random_name(letter)    
+                name = self._choose_name(letter)
                 if name is None:
                     break # computer ran out of options.
-                self.played.append(name.lower())
-                letter = self.parse_last_name(name)
+                self._mark_played(name)
+                letter = self.name_bank.last_initial(name)
         elif players == 1:
             print(self.__rules__)
             your_turn = False
             while True:
-                name = self.get_name_input(letter=letter) if your_turn else self._choose_random_name(letter)
+                started = time.perf_counter()
+                name = self.get_name_input(letter=letter) if your_turn else self._choose_name(letter)
                 if name is None:
                     if not your_turn:
                         print("You win, the computer ran out of options.")
@@ -200,10 +211,10 @@ class NameGame():
                     break           
                 else:
                     if not your_turn:
-                        time.sleep(1) # create the illusion of the CPU thinking
+                        time.sleep(max(0, 1 - (time.perf_counter() - started))) # create the illusion of the CPU thinking, less any real thinking
                     print(f"{'You' if your_turn else 'CPU'} chose {name.title()}.")
-                    self.played.append(name.lower())
-                    letter = self.parse_last_name(name)
+                    self._mark_played(name)
+                    letter = self.name_bank.last_initial(name)
                     your_turn = not your_turn # flip back and forth between yours and the computer's turn    
         
         print(self)
@@ -0,0 +1,193 @@
+"""
+A long-running Name Game server - many human-vs-CPU games at once, all sharing one name bank loaded at startup.
+Speaks JSON lines over a local TCP socket, or over stdin/stdout with --stdio. Each request is one JSON object per line:
+    {"op": "new"}                                           -> {"session": "3f2a...", "cpu": "Adam Devine", "letter": "D"}
+    {"op": "move", "session": "3f2a...", "name": "Dan Brown"} -> {"cpu": "Brad Pitt", "letter": "P", "streak": 3}
+    {"op": "quit", "session": "3f2a..."}                    -> {"result": "quit", "streak": 3, "played": [...]}
+    {"op": "stats"}                                         -> {"sessions": ..., "games": ..., "moves": ...}
+A move the CPU can't answer ends the game with {"cpu": null, "result": "win", ...}. An invalid move gets {"error": "...",
+"letter": ...} back and the game goes on, and malformed requests get {"error": "..."} with the connection left open - except
+for a line over 64 KiB, which gets an error and then the connection is closed.
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import secrets
+import sys
+from collections import OrderedDict
+
+from namegame import NameGame
+
+
+class Session():
+    """
+    One game's own state - the letter to play next and the names played so far (in order, and as a set). The shared bank is
+    never changed: the played set is an overlay, excluded from the CPU's choices. A session takes a few hundred bytes plus
+    its played names.
+    """
+    def __init__(self):
+        self.letter = None
+        self.played = []
+        self.played_set = set()
+
+
+    def add(self, name, game):
+        """ Record :name: as played, and move on to its last-name initial """
+        name = name.lower()
+        self.played.append(name)
+        self.played_set.add(name)
+        self.letter = game.name_bank.last_initial(name)
+
+
+class GameServer():
+    """
+    Hosts any number of sessions against :game: - a NameGame whose name bank is shared, read-only, by all of them.
+    At most :max_sessions: are kept; past that, the least recently used is dropped. When a game ends, the names the player
+    taught the CPU are appended to the game's name store, unless :learn: is False.
+    """
+    def __init__(self, game, max_sessions=100000, learn=True, seed=None):
+        self.game = game
+        self.sessions = OrderedDict() # session id -> Session
+        self.max_sessions = max_sessions
+        self.learn = learn
+        self.rnd = random.Random(seed)
+        self.letters = game.name_bank.letters()
+        self.games = 0
+        self.moves = 0
+
+
+    def _cpu_move(self, session):
+        """ Play the CPU's name for the session's letter, returning it, or None if it's run out of options """
+        name = self.game.name_bank.choice(session.letter, self.rnd, exclude=session.played_set)
+        if name is not None:
+            session.add(name, self.game)
+        return name
+
+
+    def _end(self, session_id, result):
+        """ Close the session, learning the player's new names, and return the game's summary """
+        session = self.sessions.pop(session_id)
+        if self.learn:
+            self.game.store.append(name for name in session.played if not self.game.name_bank.seen(name))
+            self.game.store.compact_soon()
+        return {"result": result, "streak": len(session.played), "played": [p.title() for p in session.played]}
+
+
+    def new(self):
+        """ Start a session, with the CPU's opening name on a random letter """
+        session_id = secrets.token_hex(8)
+        session = self.sessions[session_id] = Session()
+        if len(self.sessions) > self.max_sessions:
+            self.sessions.popitem(last=False) # the least recently used
+        self.games += 1
+        if not self.letters:
+            return {"session": session_id, **self._end(session_id, "win")} # an empty bank - the CPU can't open
+        session.letter = self.rnd.choice(self.letters)
+        cpu = self._cpu_move(session)
+        return {"session": session_id, "cpu": cpu.title(), "letter": session.letter.upper()}
+
+
+    def move(self, session_id, name):
+        """ Play the player's :name: in the session, then the CPU's reply """
+        session = self.sessions[session_id]
+        self.sessions.move_to_end(session_id)
+        name = re.sub(r"\s{2,}", " ", name.strip()) # handle multiple spaces in the input
+        problem = self.game.check_name(name, session.letter, session.played_set)
+        if problem is not None:
+            return {"error": problem, "letter": session.letter.upper()}
+
+        self.moves += 1
+        session.add(name, self.game)
+        cpu = self._cpu_move(session)
+        if cpu is None:
+            return {"cpu": None, **self._end(session_id, "win")}
+        return {"cpu": cpu.title(), "letter": session.letter.upper(), "streak": len(session.played)}
+
+
+    def quit(self, session_id):
+        """ End the session early """
+        return self._end(session_id, "quit")
+
+
+    def stats(self):
+        return {"sessions": len(self.sessions), "games": self.games, "moves": self.moves}
+
+
+    def handle(self, line):
+        """ Answer one request :line: (bytes or str of JSON), returning the reply line as bytes """
+        try:
+            request = json.loads(line)
+            op = request.get("op")
+            if op == "new":
+                reply = self.new()
+            elif op == "move":
+                reply = self.move(request["session"], request["name"])
+            elif op == "quit":
+                reply = self.quit(request["session"])
+            elif op == "stats":
+                reply = self.stats()
+            else:
+                reply = {"error": f"unknown op {op!r}"}
+        except KeyError as error:
+            reply = {"error": f"unknown session or missing field: {error}"}
+        except (ValueError, TypeError, AttributeError) as error:
+            reply = {"error": f"bad request: {error!r}"}
+        return (json.dumps(reply) + "\n").encode()
+
+
+    async def _serve_client(self, reader, writer):
+        """ Answer each line from one client until it disconnects """
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError): # a line over the reader's 64 KiB limit
+                    # the rest of the line would arrive looking like the next request, so answer once and hang up
+                    writer.write((json.dumps({"error": "request line too long"}) + "\n").encode())
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    writer.write(self.handle(line))
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+    async def serve_tcp(self, host="127.0.0.1", port=8766):
+        """ Serve any number of concurrent clients on :host:, :port: until cancelled """
+        server = await asyncio.start_server(self._serve_client, host, port)
+        print(f"Serving Name Games on {host}:{port}", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+
+    async def serve_stdio(self):
+        """ Answer requests from stdin on stdout until stdin closes """
+        # a blocking readline on the default executor works whether stdin is a pipe, a terminal or a redirected file
+        loop = asyncio.get_running_loop()
+        while line := await loop.run_in_executor(None, sys.stdin.buffer.readline):
+            if line.strip():
+                sys.stdout.buffer.write(self.handle(line))
+                sys.stdout.buffer.flush()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Host many Name Games against the CPU as JSON lines, with the name bank loaded once.")
+    parser.add_argument("--stdio", action="store_true", help="read requests from stdin and reply on stdout instead of a socket")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8766, help="port to listen on (default: 8766)")
+    parser.add_argument("--max-sessions", type=int, default=100000, help="number of open games to keep before dropping the least recently used")
+    parser.add_argument("--no-learn", action="store_true", help="don't add the players' new names to names.txt")
+    args = parser.parse_args()
+
+    server = GameServer(NameGame(strategy="random"), max_sessions=args.max_sessions, learn=not args.no_learn)
+    try:
+        asyncio.run(server.serve_stdio() if args.stdio else server.serve_tcp(args.host, args.port))
+    except KeyboardInterrupt:
+        print(json.dumps(server.stats()), file=sys.stderr)
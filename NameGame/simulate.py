@@ -0,0 +1,179 @@
+"""
+Headless CPU-vs-CPU Name Games, for studying streak lengths and comparing strategies.
+Games run across a process pool with no printing, no sleeping and no saving. Each worker loads and indexes the name bank
+once, and puts the played names back after every game, so a game costs only its own turns.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from namegame import NameGame
+from strategy import SearchStrategy
+
+
+STRATEGIES = ("random", "search")
+
+_worker = None # the Simulator of this worker process, set up by _init_worker
+
+
+class SimulationStats():
+    """
+    Totals over many games, mergeable across workers.
+    - games: games played
+    - first_wins: games won by the player who moved first (the one who played the last name)
+    - streaks: Counter of streak length (names played) -> games
+    - by_letter: starting letter -> [games, total streak, first player wins]
+    """
+    def __init__(self):
+        self.games = 0
+        self.first_wins = 0
+        self.streaks = Counter()
+        self.by_letter = {}
+
+
+    def add(self, letter, streak):
+        """ Count one game that started on :letter: and lasted :streak: names """
+        first_won = streak % 2 # an odd streak means the first player played the last name
+        self.games += 1
+        self.first_wins += first_won
+        self.streaks[streak] += 1
+        totals = self.by_letter.setdefault(letter, [0, 0, 0])
+        totals[0] += 1
+        totals[1] += streak
+        totals[2] += first_won
+
+
+    def merge(self, other):
+        """ Add the totals of :other: to these """
+        self.games += other.games
+        self.first_wins += other.first_wins
+        self.streaks.update(other.streaks)
+        for letter, (games, streak, first_wins) in other.by_letter.items():
+            totals = self.by_letter.setdefault(letter, [0, 0, 0])
+            totals[0] += games
+            totals[1] += streak
+            totals[2] += first_wins
+        return self
+
+
+    def mean_streak(self):
+        return sum(streak * games for streak, games in self.streaks.items()) / self.games if self.games else 0.0
+
+
+    def __repr__(self):
+        return f"SimulationStats(games={self.games:,}, first_wins={self.first_wins:,}, mean_streak={self.mean_streak():.2f})"
+
+
+    def report(self, width=50):
+        """ The streak histogram and per-letter table as text """
+        lines = [f"{self.games:,} games, first player won {self.first_wins / max(self.games, 1):.1%}, mean streak {self.mean_streak():.2f}", "", "Streak histogram:"]
+        most = max(self.streaks.values(), default=1)
+        for streak in range(min(self.streaks, default=0), max(self.streaks, default=-1) + 1):
+            games = self.streaks[streak]
+            lines.append(f"{streak:>5} {games:>10,} {'#' * round(games / most * width)}")
+        lines += ["", "Start  games  mean streak  first wins"]
+        for letter, (games, streak, first_wins) in sorted(self.by_letter.items()):
+            lines.append(f"{letter.upper():>5} {games:>6,} {streak / games:>12.2f} {first_wins / games:>11.1%}")
+        return "\n".join(lines)
+
+
+class Simulator():
+    """
+    Plays seeded CPU-vs-CPU games on one name bank: the :first: player's strategy against the :second:'s ("random" or
+    "search", with :budget: seconds a move). The bank (and the search strategy's graph) are reset after every game by
+    putting the played names back in reverse order, which leaves them exactly as they were - so a random-vs-random game
+    depends only on its seed. Search games also depend on how deep the time budget lets each move search.
+    """
+    def __init__(self, first="random", second="random", budget=0.05):
+        game = NameGame(strategy="random") # loads and indexes names.txt and its journal, once
+        self.bank = game.name_bank
+        self.letters = sorted(self.bank.letters())
+        self.rnd = random.Random()
+        self.search = None
+        if "search" in (first, second):
+            self.search = SearchStrategy(self.bank, self.bank.last_initial, budget=budget)
+        choose = {"random": lambda letter: self.bank.choice(letter, self.rnd)}
+        if self.search is not None:
+            choose["search"] = self.search.choose
+        self.players = (choose[first], choose[second])
+
+
+    def play(self, seed):
+        """ Play one game from :seed:, returning (starting letter, streak) """
+        self.rnd.seed(seed)
+        if self.search is not None:
+            self.search.rnd.seed(seed)
+            self.search.table.clear()
+        letter = start = self.letters[self.rnd.randrange(len(self.letters))]
+        played = [] # (name, index it was removed from)
+        while True:
+            name = self.players[len(played) % 2](letter)
+            if name is None:
+                break # this player ran out of options
+            played.append((name, self.bank.remove(name)))
+            if self.search is not None:
+                self.search.remove(name)
+            letter = self.bank.last_initial(name)
+
+        for name, i in reversed(played):
+            self.bank.put_back(name, i)
+            if self.search is not None:
+                self.search.add(name)
+        return start, len(played)
+
+
+def _init_worker(first, second, budget):
+    """ Worker initializer - index the bank once for every game this process plays """
+    global _worker
+    _worker = Simulator(first, second, budget)
+
+
+def _simulate_chunk(seeds):
+    """ Worker entry point - play the games for a list of seeds """
+    stats = SimulationStats()
+    for seed in seeds:
+        stats.add(*_worker.play(seed))
+    return stats
+
+
+def simulate(games, seed=0, first="random", second="random", budget=0.05, workers=None, chunk_size=1000):
+    """
+    Play :games: games across :workers: processes and return their SimulationStats.
+    Game i is always played from the seed f"{seed}-{i}", so the totals don't depend on the number of workers.
+    Chunks of seeds are only made as the pool has room for them - at most two per worker are pending - so millions of
+    games cost no more memory than a few.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = ([f"{seed}-{i}" for i in range(start, min(start + chunk_size, games))] for start in range(0, games, chunk_size))
+    stats = SimulationStats()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(first, second, budget)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_simulate_chunk, chunk))
+            if len(pending) >= workers * 2:
+                stats.merge(pending.popleft().result())
+        while pending:
+            stats.merge(pending.popleft().result())
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play CPU-vs-CPU Name Games headlessly and report the streak lengths.")
+    parser.add_argument("-n", "--games", type=int, default=100000, help="number of games to play")
+    parser.add_argument("-s", "--seed", default="0", help="seed for reproducible games")
+    parser.add_argument("--first", choices=STRATEGIES, default="random", help="strategy of the player who moves first")
+    parser.add_argument("--second", choices=STRATEGIES, default="random", help="strategy of the player who moves second")
+    parser.add_argument("--budget", type=float, default=0.05, help="seconds per move for the search strategy")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="number of worker processes (default: cpu count)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="games per task sent to a worker")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = simulate(args.games, seed=args.seed, first=args.first, second=args.second, budget=args.budget, workers=args.workers, chunk_size=args.chunk_size)
+    elapsed = time.perf_counter() - start
+    print(stats.report())
+    print(f"Played {stats.games:,} games in {elapsed:.2f}s ({stats.games / elapsed:,.0f} games/s)", file=sys.stderr)
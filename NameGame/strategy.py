@@ -0,0 +1,199 @@
+""" A game-tree search strategy for the CPU player - the name bank as a multigraph of initials, searched with alpha-beta. """
+import random
+import time
+
+
+WIN, LOSS = 1.0, -1.0
+TRAIL_CAP = 64 # longest trail the heuristic walks before calling a position too deep to judge
+EXACT, LOWER, UPPER = 0, 1, 2 # transposition table flags - whether a stored value is exact, or only a bound
+
+
+class _OutOfTime(Exception):
+    """ Raised inside the search when the move's time budget runs out """
+
+
+class SearchStrategy():
+    """
+    Picks the CPU's names by searching the game tree.
+    The bank is a multigraph with a node per initial and an edge from each name's first initial to its last-name initial.
+    Names on the same edge are interchangeable to the game, so a position is just the current letter plus how many names
+    are left on each edge - hashed incrementally (a random 64-bit key per edge, added once per remaining name) so the
+    transposition table never has to hash the counts themselves.
+    A move is searched with iterative-deepening negamax and alpha-beta pruning until :budget: seconds are up. The player
+    with no name to play loses; positions past the search depth are judged by the parity of a greedy longest trail.
+    :last_initial: maps a (lower-case) name to the first letter of its last name, e.g. NameGame.parse_last_name
+    """
+    def __init__(self, names, last_initial, budget=0.5, seed=None, table_size=1_000_000):
+        self.last_initial = last_initial
+        self.budget = budget
+        self.table_size = table_size
+        self.rnd = random.Random(seed)
+        self.nodes = {} # initial -> node index
+        self.edges = {} # (from node, to node) -> edge index
+        self.source = [] # edge index -> the node it leaves from
+        self.target = [] # edge index -> the node it leads to
+        self.counts = [] # edge index -> names left on it
+        self.names_on = [] # edge index -> set of the names left on it
+        self.keys = [] # edge index -> random 64-bit key
+        self.out_edges = [] # node index -> edge indexes leaving it
+        self.out_degree = [] # node index -> names left leaving it
+        self.in_degree = [] # node index -> names left leading to it
+        self.edge_of = {} # name -> edge index
+        self.hash = 0
+        self.table = {} # (node, hash) -> (depth, value, flag, best edge)
+        self.searched = 0 # positions visited by the last choose()
+        self.depth = 0 # deepest search completed by the last choose()
+        self._deadline = 0.0
+        for name in names:
+            self.add(name)
+
+
+    def _node(self, initial):
+        """ The node index for :initial:, adding it if it's new """
+        if initial not in self.nodes:
+            self.nodes[initial] = len(self.out_edges)
+            self.out_edges.append([])
+            self.out_degree.append(0)
+            self.in_degree.append(0)
+        return self.nodes[initial]
+
+
+    def add(self, name):
+        """ Add :name: to the bank """
+        name = name.lower()
+        if name in self.edge_of:
+            return
+        first, last = self._node(name[0]), self._node(self.last_initial(name).lower())
+        edge = self.edges.get((first, last))
+        if edge is None:
+            edge = self.edges[(first, last)] = len(self.target)
+            self.source.append(first)
+            self.target.append(last)
+            self.counts.append(0)
+            self.names_on.append(set())
+            self.keys.append(self.rnd.getrandbits(64))
+            self.out_edges[first].append(edge)
+        self.edge_of[name] = edge
+        self.names_on[edge].add(name)
+        self._take(edge, -1)
+
+
+    def remove(self, name):
+        """ Take :name: out of the bank once it's played (by either player) - names that aren't in the bank are ignored """
+        edge = self.edge_of.pop(name.lower(), None)
+        if edge is not None:
+            self.names_on[edge].discard(name.lower())
+            self._take(edge, 1)
+
+
+    def _take(self, edge, n):
+        """ Take :n: names off :edge: (or put them back, for negative :n:), keeping the out-degree and hash in step """
+        self.counts[edge] -= n
+        self.out_degree[self.source[edge]] -= n
+        self.in_degree[self.target[edge]] -= n
+        self.hash = (self.hash - n * self.keys[edge]) & 0xFFFFFFFFFFFFFFFF
+
+
+    def choose(self, letter):
+        """ Pick a name starting with :letter: for the CPU to play (without removing it), or None if there isn't one """
+        node = self.nodes.get(letter.lower())
+        if node is None or self.out_degree[node] == 0:
+            return None
+        edge = self.best_move(node)
+        return self.rnd.choice(sorted(self.names_on[edge]))
+
+
+    def best_move(self, node):
+        """ The edge to play from :node:, from the deepest search that finished within the time budget """
+        self._deadline = time.perf_counter() + self.budget
+        self.searched = 0
+        if len(self.table) > self.table_size:
+            self.table.clear()
+
+        best = self._ordered_moves(node, None)[0] # if not even a 1-ply search finishes in time
+        self.depth = 0
+        depth = 1
+        try:
+            while True:
+                value = self._negamax(node, depth, LOSS, WIN)
+                best, self.depth = self.table[(node, self.hash)][3], depth
+                if abs(value) == WIN:
+                    break # the game is decided either way - deeper searches won't change the move
+                if depth > sum(self.counts):
+                    break # searched to the end of every line
+                depth += 1
+        except _OutOfTime:
+            pass
+        return best
+
+
+    def _ordered_moves(self, node, first):
+        """ The edges with names left from :node:, trying :first: (the best move from an earlier search) first, then those leaving the opponent the fewest replies """
+        moves = [edge for edge in self.out_edges[node] if self.counts[edge]]
+        moves.sort(key=lambda edge: (edge != first, self.out_degree[self.target[edge]] - (self.source[edge] == self.target[edge])))
+        return moves
+
+
+    def _negamax(self, node, depth, alpha, beta):
+        """ The value of the position at :node: to the player about to move, between WIN and LOSS """
+        self.searched += 1
+        if self.searched & 127 == 0 and time.perf_counter() > self._deadline:
+            raise _OutOfTime()
+
+        if self.out_degree[node] == 0:
+            return LOSS # no name to play
+        if depth == 0:
+            return self._evaluate(node)
+
+        key = (node, self.hash)
+        entry = self.table.get(key)
+        first = None
+        if entry is not None:
+            stored_depth, value, flag, first = entry
+            if stored_depth >= depth or abs(value) == WIN:
+                if flag == EXACT:
+                    return value
+                if flag == LOWER and value >= beta:
+                    return value
+                if flag == UPPER and value <= alpha:
+                    return value
+
+        start_alpha = alpha
+        best_value, best_edge = LOSS - 1, None
+        for edge in self._ordered_moves(node, first):
+            self._take(edge, 1)
+            try:
+                value = -self._negamax(self.target[edge], depth - 1, -beta, -alpha)
+            finally:
+                self._take(edge, -1)
+            if value > best_value:
+                best_value, best_edge = value, edge
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        flag = UPPER if best_value <= start_alpha else LOWER if best_value >= beta else EXACT
+        self.table[key] = (depth, best_value, flag, best_edge)
+        return best_value
+
+
+    def _evaluate(self, node):
+        """
+        A guess at the value of a position too deep to search: walk a greedy longest trail from :node: - always on to the
+        initial with the most names left leaving it - on a copy of the counts. An odd trail means the player to move plays
+        the last name. Trails that reach TRAIL_CAP are too long to say anything about, and score 0 - which is known without
+        walking when every initial a name leads to still has TRAIL_CAP names leaving it.
+        """
+        if self.out_degree[node] >= TRAIL_CAP and all(out >= TRAIL_CAP for out, into in zip(self.out_degree, self.in_degree) if into):
+            return 0.0
+        counts, out_degree = self.counts[:], self.out_degree[:]
+        length = 0
+        while length < TRAIL_CAP and out_degree[node]:
+            edge = max((e for e in self.out_edges[node] if counts[e]), key=lambda e: out_degree[self.target[e]])
+            counts[edge] -= 1
+            out_degree[node] -= 1
+            node = self.target[edge]
+            length += 1
+        if length == TRAIL_CAP:
+            return 0.0
+        return 0.5 if length % 2 else -0.5
@@ -0,0 +1,101 @@
+""" Solve large files of puzzles, one per line in the 81-character format (0 or . for blanks), across a pool of processes. """
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from bitmask import BitmaskSolver
+
+
+def solve_line(line):
+    """
+    Solve a single 81-character :line:.
+    Returns the solution as an 81-character string, or an error record starting with "!!" if the line is malformed or has no solution.
+    """
+    line = line.strip()
+    if len(line) != 81 or any(c not in "0123456789." for c in line):
+        return f"!! malformed board: expected 81 characters of 0-9 or ., got {line[:90]!r}"
+
+    solver = BitmaskSolver([0 if c == "." else int(c) for c in line])
+    if not solver.valid:
+        return "!! invalid board: the given clues conflict"
+    if not solver.solve():
+        return "!! unsolvable board"
+    return "".join(map(str, solver.cells))
+
+
+def solve_chunk(lines):
+    """ Worker entry point - solve a list of :lines: and return the results in the same order """
+    return [solve_line(line) for line in lines]
+
+
+def read_chunks(f, chunk_size):
+    """ Lazily yield lists of up to :chunk_size: lines from the open file :f: """
+    while True:
+        chunk = list(islice(f, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def solve_stream(lines, workers=None, chunk_size=1000):
+    """
+    Solve an iterable of puzzle :lines: across :workers: processes, yielding one result per line in input order.
+    At most two chunks per worker are in flight at once, so memory stays flat regardless of the input size.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = read_chunks(iter(lines), chunk_size)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(solve_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def solve_file(in_path, out, workers=None, chunk_size=1000, report_every=5.0):
+    """
+    Solve every puzzle in the file at :in_path:, writing one result per line to the stream :out:.
+    Progress (puzzles/sec) is reported to stderr every :report_every: seconds and once at the end.
+    Returns a tuple of (solved, errors).
+    """
+    solved = errors = 0
+    start = last_report = time.perf_counter()
+    with open(in_path) as f:
+        for result in solve_stream(f, workers=workers, chunk_size=chunk_size):
+            out.write(result + "\n")
+            if result.startswith("!!"):
+                errors += 1
+            else:
+                solved += 1
+
+            now = time.perf_counter()
+            if now - last_report >= report_every:
+                last_report = now
+                total = solved + errors
+                print(f"{total:,} puzzles ({total / (now - start):,.0f} puzzles/sec)", file=sys.stderr)
+
+    elapsed = time.perf_counter() - start
+    total = solved + errors
+    print(f"Done: {solved:,} solved, {errors:,} errors in {elapsed:.2f}s ({total / elapsed if elapsed else 0:,.0f} puzzles/sec)", file=sys.stderr)
+    return solved, errors
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve a file of Sudoku puzzles, one 81-character puzzle per line.")
+    parser.add_argument("input", help="file of puzzles, one per line (0 or . for blanks)")
+    parser.add_argument("-o", "--output", help="file to write solutions to (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="number of worker processes (default: cpu count)")
+    parser.add_argument("-c", "--chunk-size", type=int, default=1000, help="puzzles per task sent to a worker")
+    args = parser.parse_args()
+
+    if args.output:
+        with open(args.output, "w") as out:
+            solve_file(args.input, out, workers=args.workers, chunk_size=args.chunk_size)
+    else:
+        solve_file(args.input, sys.stdout, workers=args.workers, chunk_size=args.chunk_size)
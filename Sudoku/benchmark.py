@@ -0,0 +1,84 @@
+import random
+import time
+
+from sudoku import SudokuBoard, parse_line
+
+
+# well known "hardest" puzzles, one per line in the 81-character format (0 for blanks)
+HARDEST = [
+    "800000000003600000070090200050007000000045700000100030001000068008500010090000400", # Arto Inkala 2012
+    "100007090030020008009600500005300900010080002600004000300000010040000007007000300", # AI Escargot
+    "000000039000001005003050800008090006070002000100400000009080050020000600400700000", # Golden Nugget
+    "000000012000000003002300400001800005060070800000009000008500000900040500470006000", # Platinum Blonde
+    "100000002090400050006000700050903000000070000000850040700000600030009080002000001", # Easter Monster
+]
+
+# the example from sudoku.py - solved by singles alone, like most published puzzles
+EASY = "362145700040000630008000000500002073023070590790400001000000200034000010005924367"
+
+# a minimal (no clue can be removed without losing uniqueness) 16x16 puzzle, 1-9 then A-G, 0 for blanks
+HARD_16 = "E00000000G80200580A0B3029701000001070C4000000000B000800D400007F020E000008400090B6C00190000DG05000000008C0003000F0GFA0000B010C4600EC00100G04002030800023000A0E050A0010000000B000G00004D00C050F10005600F00D0009B72G00030002B0940000408700010GA0000092000046E300000"
+
+
+def parse_16(line):
+    """ Turn a 256-character line (1-9, A-G, 0 for blanks) into a list of 16 lists of 16 ints """
+    values = [int(c, 17) for c in line.strip()]
+    return [values[r*16:r*16 + 16] for r in range(16)]
+
+
+def time_engine(puzzles, engine):
+    """ Solve every puzzle with the given :engine: and return the elapsed seconds """
+    start = time.perf_counter()
+    for line in puzzles:
+        board = SudokuBoard(parse_line(line))
+        assert board.solve(engine=engine)
+    return time.perf_counter() - start
+
+
+def variant(line, rnd):
+    """ A puzzle equivalent to :line: (same difficulty, one solution if it has one) - digits relabelled, bands/stacks and their rows/columns shuffled """
+    board = parse_line(line)
+    digits = [0] + rnd.sample(range(1, 10), 9)
+    rows = [b*3 + r for b in rnd.sample(range(3), 3) for r in rnd.sample(range(3), 3)]
+    cols = [b*3 + c for b in rnd.sample(range(3), 3) for c in rnd.sample(range(3), 3)]
+    return [[digits[board[r][c]] for c in cols] for r in rows]
+
+
+def time_batch(count=5000, seed=0):
+    """ Compare solve_batch on :count: variants of EASY against looping over SudokuBoard.solve """
+    try:
+        import numpy as np
+        from vectorized import solve_batch
+    except ModuleNotFoundError:
+        print("numpy is not installed, skipping the batch benchmark")
+        return
+
+    rnd = random.Random(seed)
+    boards = [variant(EASY, rnd) for _ in range(count)]
+
+    start = time.perf_counter()
+    for board in boards:
+        SudokuBoard([row[:] for row in board]).solve()
+    loop = time.perf_counter() - start
+
+    array = np.array(boards, dtype=np.uint8)
+    start = time.perf_counter()
+    _, solved = solve_batch(array)
+    batch = time.perf_counter() - start
+    assert solved.all()
+
+    print(f"{'loop':<10} {count} boards in {loop:.3f}s ({count / loop:,.0f} boards/sec)")
+    print(f"{'batch':<10} {count} boards in {batch:.3f}s ({count / batch:,.0f} boards/sec)")
+
+
+if __name__ == "__main__":
+    for engine in ["backtrack", "bitmask", "dlx"]:
+        elapsed = time_engine(HARDEST, engine)
+        print(f"{engine:<10} {len(HARDEST)} puzzles in {elapsed:.3f}s ({elapsed / len(HARDEST) * 1000:.1f} ms/puzzle)")
+
+    board = SudokuBoard(parse_16(HARD_16))
+    start = time.perf_counter()
+    assert board.solve(engine="dlx")
+    print(f"{'dlx':<10} 16x16 puzzle in {time.perf_counter() - start:.3f}s")
+
+    time_batch()
@@ -0,0 +1,230 @@
+""" Constraint-propagation Sudoku engine built on per-row, per-column and per-box candidate bitmasks. """
+import time
+
+from stats import SolverStats
+
+ALL_DIGITS = 0b111111111 # bit (d-1) is set when digit d is still available
+
+# lookup tables for the flat 81-cell layout (index = row*9 + col)
+ROW_OF = [i // 9 for i in range(81)]
+COL_OF = [i % 9 for i in range(81)]
+BOX_OF = [(i // 9) // 3 * 3 + (i % 9) // 3 for i in range(81)]
+UNITS = (
+    [[r*9 + c for c in range(9)] for r in range(9)] + # rows
+    [[r*9 + c for r in range(9)] for c in range(9)] + # columns
+    [[(b // 3 * 3 + i // 3)*9 + b % 3 * 3 + i % 3 for i in range(9)] for b in range(9)] # boxes
+)
+
+
+class BitmaskSolver():
+    """
+    Solve a 9x9 board held as a flat bytearray of 81 cells (0 for blanks).
+    Used digits are tracked as one bitmask per row, column and box, so the candidates for a cell are a couple of ORs away.
+    Every placement is pushed to a trail (the undo log), so a failed guess is undone by popping back to a mark rather than copying the board.
+    The search keeps its open guesses on an explicit, preallocated stack instead of recursing, and counts its work in :stats:.
+    """
+    def __init__(self, cells):
+        start = time.perf_counter()
+        self.cells = bytearray(81)
+        self.rows = [0] * 9
+        self.cols = [0] * 9
+        self.boxes = [0] * 9
+        self.trail = [] # cell indexes in the order they were filled
+        self.stats = SolverStats()
+        self.valid = True
+
+        for i, value in enumerate(cells):
+            if value == 0:
+                continue
+            if not 1 <= value <= 9 or not self._candidates(i) & (1 << (value - 1)):
+                self.valid = False # out of range, or the given clues already clash
+                break
+            self._place(i, value)
+        self.trail = [] # the givens are never undone
+        self.stats.times["setup"] = time.perf_counter() - start
+
+
+    @classmethod
+    def from_board(cls, board):
+        """ Build a solver from a :board: given as a list of 9 lists of 9 ints """
+        return cls([value for row in board for value in row])
+
+
+    def to_board(self):
+        """ Return the cells as a list of 9 lists of 9 ints """
+        return [list(self.cells[r*9:r*9 + 9]) for r in range(9)]
+
+
+    def _candidates(self, i):
+        """ Bitmask of the digits that could still go in cell :i: """
+        return ALL_DIGITS & ~(self.rows[ROW_OF[i]] | self.cols[COL_OF[i]] | self.boxes[BOX_OF[i]])
+
+
+    def _place(self, i, digit):
+        """ Write :digit: to cell :i: and mark it as used in the cell's row, column and box """
+        bit = 1 << (digit - 1)
+        self.cells[i] = digit
+        self.rows[ROW_OF[i]] |= bit
+        self.cols[COL_OF[i]] |= bit
+        self.boxes[BOX_OF[i]] |= bit
+        self.trail.append(i)
+
+
+    def _undo(self, mark):
+        """ Clear every cell placed since the trail was :mark: long """
+        trail = self.trail
+        while len(trail) > mark:
+            i = trail.pop()
+            bit = ~(1 << (self.cells[i] - 1))
+            self.cells[i] = 0
+            self.rows[ROW_OF[i]] &= bit
+            self.cols[COL_OF[i]] &= bit
+            self.boxes[BOX_OF[i]] &= bit
+
+
+    def _propagate(self):
+        """
+        Fill in naked singles (a cell with one candidate) and hidden singles (a digit with one home in a unit) until nothing changes.
+        Returns the most-constrained empty cell as (index, candidates), (None, 0) if the board is full, or None on a contradiction.
+        """
+        cells = self.cells
+        stats = self.stats
+        while True:
+            changed = False
+            best, best_mask, best_count = None, 0, 10
+            for i in range(81):
+                if cells[i]:
+                    continue
+                mask = self._candidates(i)
+                if mask == 0:
+                    return None
+                if mask & (mask - 1) == 0: # naked single
+                    self._place(i, mask.bit_length())
+                    stats.propagations += 1
+                    changed = True
+                    continue
+                count = mask.bit_count()
+                if count < best_count:
+                    best, best_mask, best_count = i, mask, count
+
+            if changed:
+                continue
+
+            if best is None:
+                return None, 0 # solved
+
+            for unit in UNITS:
+                # collect, for every digit, whether it has zero, one or several homes in this unit
+                seen_once, seen_twice, placed = 0, 0, 0
+                for i in unit:
+                    if cells[i]:
+                        placed |= 1 << (cells[i] - 1)
+                        continue
+                    mask = self._candidates(i)
+                    seen_twice |= seen_once & mask
+                    seen_once |= mask
+                if (seen_once | placed) != ALL_DIGITS:
+                    return None # some digit has nowhere to go
+                singles = seen_once & ~seen_twice
+                if singles == 0:
+                    continue
+                for i in unit:
+                    if cells[i] == 0:
+                        hit = self._candidates(i) & singles
+                        if hit:
+                            if hit & (hit - 1):
+                                return None # one cell is the only home for two digits
+                            self._place(i, hit.bit_length())
+                            stats.propagations += 1
+                            changed = True
+
+            if not changed:
+                return best, best_mask
+
+
+    def _timed_propagate(self):
+        """ _propagate, with its wall time added to the stats """
+        start = time.perf_counter()
+        result = self._propagate()
+        self.stats.times["propagate"] += time.perf_counter() - start
+        return result
+
+
+    def _search(self, limit, keep):
+        """
+        Depth-first search over the most-constrained cell, propagating after every guess.
+        Open guesses live on three parallel stacks (cell, digits left to try, trail mark) indexed by :depth:, so nothing is allocated per node.
+        Stops after :limit: solutions and returns how many were found. If :keep: is True the cells are left at the last solution found,
+        otherwise they are restored to the givens.
+        """
+        stats = self.stats
+        cell_stack = bytearray(81)
+        mask_stack = [0] * 81
+        mark_stack = [0] * 81
+        depth = 0
+        base = len(self.trail)
+        found = 0
+
+        result = self._timed_propagate()
+        while True:
+            if result is not None:
+                i, mask = result
+                if i is None:
+                    found += 1
+                    if found >= limit:
+                        if not keep:
+                            self._undo(base)
+                        return found
+                else:
+                    # open a new guess on the most-constrained cell
+                    cell_stack[depth] = i
+                    mask_stack[depth] = mask
+                    mark_stack[depth] = len(self.trail)
+                    depth += 1
+                    if depth > stats.max_depth:
+                        stats.max_depth = depth
+
+            # try the next digit of the innermost open guess, dropping the guesses that have run out of digits
+            while depth:
+                top = depth - 1
+                self._undo(mark_stack[top])
+                mask = mask_stack[top]
+                if mask:
+                    bit = mask & -mask
+                    mask_stack[top] = mask ^ bit
+                    self._place(cell_stack[top], bit.bit_length())
+                    stats.nodes += 1
+                    result = self._timed_propagate()
+                    break
+                depth -= 1
+                stats.backtracks += 1
+            else:
+                self._undo(base)
+                return found
+
+
+    def solve(self):
+        """
+        Solve in place (the cells are left as given if there is no solution).
+        Returns the SolverStats, which are truthy if a solution was found.
+        """
+        stats = self.stats
+        if self.valid:
+            start, propagated = time.perf_counter(), stats.times["propagate"]
+            stats.solved = self._search(limit=1, keep=True) == 1
+            stats.times["search"] += time.perf_counter() - start - (stats.times["propagate"] - propagated) # only this call's propagation
+        return stats
+
+
+    def count_solutions(self, limit=2):
+        """
+        Count the solutions of the board, stopping as soon as :limit: have been found.
+        The cells are left as given.
+        """
+        if not self.valid:
+            return 0
+        stats = self.stats
+        start, propagated = time.perf_counter(), stats.times["propagate"]
+        count = self._search(limit=limit, keep=False)
+        stats.times["search"] += time.perf_counter() - start - (stats.times["propagate"] - propagated)
+        return count
@@ -0,0 +1,335 @@
+""" Exact-cover (Algorithm X) Sudoku engine for any box size, with optional extra units such as the diagonals of Sudoku-X. """
+import random
+import time
+from math import isqrt
+
+from stats import SolverStats
+
+
+class ExactCoverSolver():
+    """
+    Solve an N^2 x N^2 board (N = :box_size:) given as a flat list of ints (0 for blanks), row by row.
+
+    Every (row, col, digit) placement is a candidate row of the exact-cover matrix, and the constraints are its columns:
+    - each cell holds exactly one digit
+    - each row, column and box holds each digit exactly once
+    - each of the :extra_units: (lists of (row, col) coordinates) holds each digit once - exactly once for a full unit of N^2 cells, at most once for a shorter one
+
+    Instead of a linked-list matrix, columns map to the set of candidate rows that satisfy them and candidate rows map to the list of columns they
+    satisfy (Knuth's dancing links with dicts and sets), so covering and uncovering a column are set operations. Before each
+    guess, forced columns are selected and locked candidates removed. Ties between equally good guesses are broken by a
+    random.Random(:seed:), so a solve is repeatable.
+    """
+    def __init__(self, cells, box_size=3, extra_units=(), seed=0):
+        start = time.perf_counter()
+        n = box_size * box_size
+        self.box_size = box_size
+        self.size = n
+        self.cells = list(cells)
+        self.valid = len(self.cells) == n * n
+
+        # column ids: cell constraints, then row/digit, col/digit, box/digit, and extra unit/digit
+        n2 = n * n
+        self.rows = {} # candidate row id -> list of column ids
+        for r in range(n):
+            for c in range(n):
+                b = r // box_size * box_size + c // box_size
+                for d in range(n):
+                    self.rows[(r*n + c)*n + d] = [r*n + c, n2 + r*n + d, 2*n2 + c*n + d, 3*n2 + b*n + d]
+
+        self.primary = set(range(4 * n2))
+        for k, unit in enumerate(extra_units):
+            unit = set(unit)
+            if any(not (0 <= r < n and 0 <= c < n) for r, c in unit):
+                raise ValueError(f"extra unit {k} has cells outside the {n}x{n} board")
+            if len(unit) > n:
+                self.valid = False # more cells than digits - they can't all differ
+            for r, c in unit:
+                for d in range(n):
+                    column = 4*n2 + k*n + d
+                    self.rows[(r*n + c)*n + d].append(column)
+                    if len(unit) == n:
+                        self.primary.add(column)
+
+        self.columns = {} # column id -> set of candidate row ids
+        for row_id, columns in self.rows.items():
+            for column in columns:
+                self.columns.setdefault(column, set()).add(row_id)
+
+        # uncovered columns bucketed by their number of candidate rows, so the smallest column is found without scanning them all
+        self.by_size = [set() for _ in range(max(map(len, self.columns.values())) + 1)]
+        for column, candidates in self.columns.items():
+            self.by_size[len(candidates)].add(column)
+
+        # place the givens
+        self.givens = []
+        for i, value in enumerate(self.cells if self.valid else []):
+            if value == 0:
+                continue
+            row_id = i*n + value - 1
+            if not 1 <= value <= n or any(column not in self.columns for column in self.rows[row_id]):
+                self.valid = False # out of range, or the given clues already clash
+                break
+            self._select(row_id)
+            self.givens.append(row_id)
+        self.rnd = random.Random(seed) # breaks ties between equally small columns
+        self.stats = SolverStats()
+        self.stats.times["setup"] = time.perf_counter() - start
+
+
+    @classmethod
+    def from_board(cls, board, extra_units=()):
+        """ Build a solver from a :board: given as a list of N^2 lists of N^2 ints """
+        box_size = isqrt(len(board))
+        return cls([value for row in board for value in row], box_size=box_size, extra_units=extra_units)
+
+
+    def to_board(self):
+        """ Return the cells as a list of N^2 lists of N^2 ints """
+        n = self.size
+        return [self.cells[r*n:r*n + n] for r in range(n)]
+
+
+    def _select(self, row_id):
+        """ Cover every column satisfied by :row_id:, removing the candidate rows that clash with it. Returns the removed columns. """
+        columns, rows, by_size = self.columns, self.rows, self.by_size
+        removed = []
+        for column in rows[row_id]:
+            candidates = columns.pop(column)
+            by_size[len(candidates)].discard(column)
+            for other in candidates:
+                for other_column in rows[other]:
+                    if other_column != column:
+                        shrinking = columns[other_column]
+                        size = len(shrinking)
+                        by_size[size].remove(other_column)
+                        by_size[size - 1].add(other_column)
+                        shrinking.remove(other)
+            removed.append(candidates)
+        return removed
+
+
+    def _deselect(self, row_id, removed):
+        """ Undo :_select: by restoring the :removed: columns in reverse order """
+        columns, rows, by_size = self.columns, self.rows, self.by_size
+        for column in reversed(rows[row_id]):
+            candidates = removed.pop()
+            for other in candidates:
+                for other_column in rows[other]:
+                    if other_column != column:
+                        growing = columns[other_column]
+                        size = len(growing)
+                        by_size[size].remove(other_column)
+                        by_size[size + 1].add(other_column)
+                        growing.add(other)
+            columns[column] = candidates
+            by_size[len(candidates)].add(column)
+
+
+    def _remove_row(self, row_id):
+        """ Take the candidate :row_id: out of every column it satisfies, without covering any of them """
+        columns, by_size = self.columns, self.by_size
+        for column in self.rows[row_id]:
+            shrinking = columns[column]
+            size = len(shrinking)
+            by_size[size].remove(column)
+            by_size[size - 1].add(column)
+            shrinking.remove(row_id)
+
+
+    def _restore_row(self, row_id):
+        """ Undo :_remove_row: """
+        columns, by_size = self.columns, self.by_size
+        for column in reversed(self.rows[row_id]):
+            growing = columns[column]
+            size = len(growing)
+            by_size[size].remove(column)
+            by_size[size + 1].add(column)
+            growing.add(row_id)
+
+
+    def _undo(self, trail, mark):
+        """ Undo every selection and row removal since the :trail: was :mark: long """
+        while len(trail) > mark:
+            row_id, removed = trail.pop()
+            if removed is None:
+                self._restore_row(row_id)
+            else:
+                self._deselect(row_id, removed)
+
+
+    def _smallest_column(self):
+        """
+        An uncovered primary column with the fewest candidate rows, or None once every primary column is covered. Ties go to
+        a cell column (choosing a cell's digit) over a unit one, then are broken at random, so no board is stuck with an
+        unlucky column order.
+        """
+        primary, first_unit = self.primary, self.size * self.size
+        for bucket in self.by_size:
+            tied = [column for column in bucket if column in primary]
+            if tied:
+                cells = [column for column in tied if column < first_unit]
+                return self.rnd.choice(cells or tied)
+        return None
+
+
+    def _eliminate_locked(self, trail, since):
+        """
+        Locked candidates: when every candidate row of a primary unit/digit column also satisfies some other column - a digit
+        confined to one row of a box, say - that column can't take any other row, so those rows are removed (and trailed).
+        Only columns that lost candidates since the :trail: was :since: long are checked (all of them if :since: is None), as
+        the rest were already checked at that point, and only those with at most :box_size: candidates, the most a digit
+        locked into one line of a box can have. Returns whether any row was removed.
+        """
+        columns, rows, primary = self.columns, self.rows, self.primary
+        if since is None:
+            touched = columns.keys()
+        else:
+            touched = set()
+            for row_id, removed in trail[since:]:
+                if removed is None:
+                    touched.update(rows[row_id])
+                else:
+                    for candidates in removed:
+                        for other in candidates:
+                            touched.update(rows[other])
+
+        first_unit = self.size * self.size # the cell columns come first, and their rows never share another column
+        eliminated = False
+        for column in list(touched):
+            candidates = columns.get(column)
+            if column < first_unit or column not in primary or candidates is None or not 2 <= len(candidates) <= self.box_size:
+                continue
+            rest = iter(candidates)
+            shared = [other for other in rows[next(rest)] if other != column]
+            for row_id in rest:
+                shared = [other for other in shared if other in rows[row_id]]
+            for other in shared:
+                for row_id in list(columns[other] - candidates):
+                    self._remove_row(row_id)
+                    trail.append((row_id, None))
+                    self.stats.propagations += 1
+                    eliminated = True
+        return eliminated
+
+
+    def _propagate(self, trail, since=None):
+        """
+        Select forced rows (a primary column with one candidate left) and remove locked candidates until neither applies,
+        starting from a board that was fully propagated when the :trail: was :since: long (None for a fresh board).
+        Returns the candidate rows of a smallest primary column to branch on, [] once every primary column is covered, or None
+        on a contradiction (a primary column with no candidates). The rows that clash with the most others come first (ties
+        in random order), so a guess either settles much of the board or fails quickly.
+        """
+        columns, stats = self.columns, self.stats
+        while True:
+            best = self._smallest_column()
+            if best is None:
+                return []
+            candidates = columns[best]
+            if not candidates:
+                return None
+            if len(candidates) == 1:
+                row_id = next(iter(candidates))
+                trail.append((row_id, self._select(row_id)))
+                stats.propagations += 1
+                continue
+            checked = len(trail)
+            if not self._eliminate_locked(trail, since):
+                candidates = list(candidates)
+                self.rnd.shuffle(candidates)
+                candidates.sort(key=lambda row_id: sum(len(columns[column]) for column in self.rows[row_id]), reverse=True)
+                return candidates
+            since = checked
+
+
+    def _timed_propagate(self, trail, since=None):
+        """ _propagate, with its wall time added to the stats """
+        start = time.perf_counter()
+        result = self._propagate(trail, since)
+        self.stats.times["propagate"] += time.perf_counter() - start
+        return result
+
+
+    def _find(self, limit):
+        """
+        Algorithm X, propagating after every guess: branch on a primary column with the fewest candidate rows and try each
+        in turn. Open guesses live on parallel stacks (candidate rows, next one to try, trail mark) instead of recursing, so
+        boards of any size fit in the interpreter's stack. Every selection and removal goes on a trail (the undo log), and a
+        failed guess is undone by popping back to its mark.
+        Returns up to :limit: solutions, each a list of the selected candidate row ids, with the matrix left as it started.
+        """
+        if not self.valid:
+            return []
+        stats = self.stats
+        trail = [] # (row id, removed columns) per selection, (row id, None) per removed row
+        candidate_stack, next_stack, mark_stack = [], [], []
+        found = []
+
+        result = self._timed_propagate(trail)
+        while True:
+            if result is not None:
+                if not result:
+                    found.append([row_id for row_id, removed in trail if removed is not None])
+                    if len(found) >= limit:
+                        break
+                else:
+                    candidate_stack.append(result)
+                    next_stack.append(0)
+                    mark_stack.append(len(trail))
+                    if len(candidate_stack) > stats.max_depth:
+                        stats.max_depth = len(candidate_stack)
+
+            # try the next candidate of the innermost open guess, dropping the guesses that have run out of candidates
+            while candidate_stack:
+                self._undo(trail, mark_stack[-1])
+                i = next_stack[-1]
+                if i < len(candidate_stack[-1]):
+                    next_stack[-1] = i + 1
+                    row_id = candidate_stack[-1][i]
+                    trail.append((row_id, self._select(row_id)))
+                    stats.nodes += 1
+                    result = self._timed_propagate(trail, mark_stack[-1])
+                    break
+                candidate_stack.pop()
+                next_stack.pop()
+                mark_stack.pop()
+                stats.backtracks += 1
+            else:
+                break
+
+        self._undo(trail, 0)
+        return found
+
+
+    def solve(self):
+        """
+        Solve in place (the cells are left as given if there is no solution).
+        Returns the SolverStats, which are truthy if a solution was found.
+        """
+        start, propagated = time.perf_counter(), self.stats.times["propagate"]
+        found = self._find(1)
+        self.stats.times["search"] += time.perf_counter() - start - (self.stats.times["propagate"] - propagated)
+        if found:
+            n = self.size
+            for row_id in found[0]:
+                cell, digit = divmod(row_id, n)
+                self.cells[cell] = digit + 1
+            self.stats.solved = True
+        return self.stats
+
+
+    def count_solutions(self, limit=2):
+        """ Count the solutions of the board, stopping as soon as :limit: have been found. The cells are left as given. """
+        start, propagated = time.perf_counter(), self.stats.times["propagate"]
+        found = self._find(limit)
+        self.stats.times["search"] += time.perf_counter() - start - (self.stats.times["propagate"] - propagated)
+        return len(found)
+
+
+def diagonal_units(size=9):
+    """ The two main diagonals of a :size: x :size: board as lists of (row, col) coordinates, as used by Sudoku-X """
+    return [
+        [(i, i) for i in range(size)],
+        [(i, size - 1 - i) for i in range(size)],
+    ]
@@ -0,0 +1,137 @@
+""" Generate Sudoku puzzles with exactly one solution, written in the 81-character line format (0 for blanks). """
+import argparse
+import os
+import random
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from bitmask import BitmaskSolver
+
+
+# difficulty levels as ranges of guesses the bitmask engine needs to solve the puzzle (propagation alone solves the easy ones)
+DIFFICULTY = {
+    "easy": (0, 0),
+    "medium": (1, 3),
+    "hard": (4, None),
+}
+
+
+def random_solution(rnd):
+    """ A random, completely filled board as a flat list of 81 ints, drawn with the random.Random instance :rnd: """
+    cells = [0] * 81
+    # the three boxes on the main diagonal don't share a row or column, so any fill of them is consistent
+    for box in (0, 4, 8):
+        digits = rnd.sample(range(1, 10), 9)
+        for k, digit in enumerate(digits):
+            cells[(box // 3 * 3 + k // 3)*9 + box % 3 * 3 + k % 3] = digit
+
+    solver = BitmaskSolver(cells)
+    solver.solve()
+    return list(solver.cells)
+
+
+def rate(cells):
+    """ The number of guesses the bitmask engine needs to solve :cells: - 0 means singles alone solve it """
+    return BitmaskSolver(cells).solve().nodes
+
+
+def difficulty_of(guesses):
+    """ The name of the DIFFICULTY level for a puzzle that needs :guesses: """
+    for name, (low, high) in DIFFICULTY.items():
+        if guesses >= low and (high is None or guesses <= high):
+            return name
+
+
+def remove_clues(cells, rnd, clues=None):
+    """
+    Blank out the clues of the solved board :cells: one at a time in random order, keeping a blank only if the puzzle still has
+    exactly one solution. Stops once :clues: remain (or when no clue can be removed, if :clues: is None).
+    The uniqueness check stops counting as soon as a second solution turns up.
+    """
+    puzzle = list(cells)
+    remaining = 81
+    order = list(range(81))
+    rnd.shuffle(order)
+    for i in order:
+        if clues is not None and remaining <= clues:
+            break
+        value, puzzle[i] = puzzle[i], 0
+        if BitmaskSolver(puzzle).count_solutions(limit=2) == 1:
+            remaining -= 1
+        else:
+            puzzle[i] = value
+    return puzzle
+
+
+def generate(seed, clues=None, difficulty=None, attempts=100):
+    """
+    Generate one puzzle from :seed: (anything random.Random accepts, so the same seed always gives the same puzzle).
+    :clues: the target number of clues, or None for a minimal puzzle (no clue can be removed)
+    :difficulty: one of the DIFFICULTY names, or None for any
+    Returns the puzzle as an 81-character string, or None if no puzzle matched after :attempts: boards.
+    """
+    rnd = random.Random(seed)
+    for _ in range(attempts):
+        puzzle = remove_clues(random_solution(rnd), rnd, clues=clues)
+        if clues is not None and sum(1 for value in puzzle if value) > clues:
+            continue # got stuck above the target, start over from a new board
+        if difficulty is not None and difficulty_of(rate(puzzle)) != difficulty:
+            continue
+        return "".join(map(str, puzzle))
+    return None
+
+
+def _generate_chunk(args):
+    """ Worker entry point - generate the puzzles for a list of seeds """
+    seeds, clues, difficulty = args
+    return [generate(seed, clues=clues, difficulty=difficulty) for seed in seeds]
+
+
+def generate_many(count, seed=0, clues=None, difficulty=None, workers=None, chunk_size=50):
+    """
+    Yield :count: puzzles generated across :workers: processes, in a reproducible order.
+    Puzzle i is always generated from the seed f"{seed}-{i}", so the output doesn't depend on the number of workers.
+    Chunks of seeds are only made as the pool has room for them - at most two per worker are pending - so a huge :count:
+    costs no more memory than a small one.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = (
+        ([f"{seed}-{i}" for i in range(start, min(start + chunk_size, count))], clues, difficulty)
+        for start in range(0, count, chunk_size)
+    )
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_generate_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate Sudoku puzzles with a unique solution, one 81-character puzzle per line.")
+    parser.add_argument("-n", "--count", type=int, default=10, help="number of puzzles to generate")
+    parser.add_argument("-s", "--seed", default="0", help="seed for reproducible output")
+    parser.add_argument("--clues", type=int, default=None, help="target number of clues (default: as few as possible)")
+    parser.add_argument("--difficulty", choices=list(DIFFICULTY), default=None, help="only keep puzzles of this difficulty")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="number of worker processes (default: cpu count)")
+    parser.add_argument("-o", "--output", help="file to write puzzles to (default: stdout)")
+    args = parser.parse_args()
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    start = time.perf_counter()
+    made = 0
+    for puzzle in generate_many(args.count, seed=args.seed, clues=args.clues, difficulty=args.difficulty, workers=args.workers):
+        if puzzle is None:
+            print("!! No puzzle matched the requested clues/difficulty", file=sys.stderr)
+            continue
+        out.write(puzzle + "\n")
+        made += 1
+    if out is not sys.stdout:
+        out.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Generated {made:,} puzzles in {elapsed:.2f}s ({made / elapsed * 60:,.0f} puzzles/min)", file=sys.stderr)
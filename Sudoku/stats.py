@@ -0,0 +1,31 @@
+""" Counters collected while solving a board, for profiling slow puzzles. """
+
+
+class SolverStats():
+    """
+    Returned by the solve() methods. Truthy when the board was solved, so `if board.solve():` keeps working.
+    - nodes: guesses tried on a cell (or exact-cover column) that propagation couldn't settle
+    - backtracks: guesses abandoned once every digit under them failed
+    - propagations: cells filled by naked/hidden singles (or forced exact-cover columns, and locked candidates removed)
+    - max_depth: deepest stack of open guesses
+    - times: wall time in seconds per phase - setup (placing the givens), propagate and search (the rest of the solve)
+    """
+    def __init__(self):
+        self.solved = False
+        self.nodes = 0
+        self.backtracks = 0
+        self.propagations = 0
+        self.max_depth = 0
+        self.times = {"setup": 0.0, "propagate": 0.0, "search": 0.0}
+
+
+    def __bool__(self):
+        return self.solved
+
+
+    def __repr__(self):
+        times = ", ".join(f"{phase}={seconds * 1000:.2f}ms" for phase, seconds in self.times.items())
+        return (
+            f"SolverStats(solved={self.solved}, nodes={self.nodes:,}, backtracks={self.backtracks:,}, "
+            f"propagations={self.propagations:,}, max_depth={self.max_depth}, {times})"
+        )
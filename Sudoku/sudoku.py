@@ -1,11 +1,25 @@
-import re 
+from math import isqrt
+
+import time
+
+from bitmask import BitmaskSolver
+from dlx import ExactCoverSolver, diagonal_units
+from stats import SolverStats
 
 class SudokuBoard():
-    def __init__(self, board):
+    def __init__(self, board, diagonals=False, extra_units=None):
         """ 
-        Initiliaze with a list of lists, where each sublist 
+        Initiliaze with a list of lists, where each sublist is a row of the board (0 for blanks).
+        Any N^2 x N^2 board is accepted (9x9, 16x16, 25x25, ...).
+        :diagonals=True: also require each digit once on both main diagonals (Sudoku-X)
+        :extra_units: optional list of extra units, each a list of (row, col) coordinates whose digits must all differ
         """
         self.board = board
+        self.size = len(board)
+        self.box_size = isqrt(self.size)
+        self.extra_units = [list(unit) for unit in extra_units or []]
+        if diagonals:
+            self.extra_units.extend(diagonal_units(self.size))
         self.valid = self.is_board_valid()
         if not self.valid:
             print("!! Given board is not valid")
@@ -17,21 +31,33 @@ class SudokuBoard():
 
     def _print_board(self):
         """ An internal method used for board printing """
+        width = len(str(self.size))
         parts = ["\n"]
-        for i, row in enumerate(layout):
-            if i % 3 == 0 and i > 0:
-                parts += "  "+ "-"*31 + "\n"
-            row_string = "".join([str(r) for r in row])
-            re_row = re.compile(r"(\d)(\d)(\d)(\d)(\d)(\d)(\d)(\d)(\d)")
-            parts += re_row.sub("  \\1  \\2  \\3  |  \\4  \\5  \\6  |  \\7  \\8  \\9  \n", row_string)
+        for i, row in enumerate(self.board):
+            if i % self.box_size == 0 and i > 0:
+                parts += "  "+ "-"*(self.size*(width+2) + (self.box_size-1)*3 - 2) + "\n"
+            for j, value in enumerate(row):
+                if j % self.box_size == 0 and j > 0:
+                    parts += "  |"
+                parts += "  " + str(value).rjust(width)
+            parts += "  \n"
         return "".join(parts)
 
 
     def is_board_valid(self):
-        """ Determines if the given board is valid by checking the dimensions """
+        """
+        Determines if the given board is valid by checking the dimensions - N^2 rows of N^2 columns - and that every extra
+        unit has its cells on the board, with no more of them than there are digits to tell apart
+        """
         row_count = len(self.board)
-        column_count = len([len(row) for row in self.board if len(row) == 9])
-        return True if row_count == 9 and column_count == 9 else False
+        column_count = len([len(row) for row in self.board if len(row) == row_count])
+        if not (row_count > 0 and self.box_size**2 == row_count and column_count == row_count):
+            return False
+        for unit in self.extra_units:
+            cells = set(unit)
+            if len(cells) > row_count or any(not (0 <= r < row_count and 0 <= c < row_count) for r, c in cells):
+                return False
+        return True
 
 
     def find_next_empty(self):
@@ -39,8 +65,8 @@ class SudokuBoard():
         Find the next empty space on the board. Works from left-to-right, top-to-bottom.
         Returns a coordinate - a tuple of index positions: <row, col>. If no empty positions are found, returns None, None.
         """
-        for row in range(9):
-            for col in range(9):
+        for row in range(self.size):
+            for col in range(self.size):
                 if self.board[row][col] == 0:
                     return row, col
         
@@ -58,25 +84,75 @@ class SudokuBoard():
         
         # check column
         board_column = []
-        for c in range(9):
+        for c in range(self.size):
             board_column.append(self.board[c][col])
         if guess in board_column:
             return False
         
         # check subgrid
         board_subgrid = []
-        subgrid_startpos_x = row // 3 * 3
-        subgrid_startpos_y = col // 3 * 3
-        for row in range(subgrid_startpos_x, subgrid_startpos_x+3):
-            for col in range(subgrid_startpos_y, subgrid_startpos_y+3):
-                board_subgrid.append(self.board[row][col])
+        subgrid_startpos_x = row // self.box_size * self.box_size
+        subgrid_startpos_y = col // self.box_size * self.box_size
+        for r in range(subgrid_startpos_x, subgrid_startpos_x+self.box_size):
+            for c in range(subgrid_startpos_y, subgrid_startpos_y+self.box_size):
+                board_subgrid.append(self.board[r][c])
         if guess in board_subgrid:
             return False
         
+        # check any extra units (e.g. diagonals) the cell belongs to
+        for unit in self.extra_units:
+            if (row, col) in unit and guess in [self.board[r][c] for r, c in unit]:
+                return False
+        
         return True
 
 
-    def solve(self):
+    def solve(self, engine=None):
+        """
+        Solve the board in place. Returns a SolverStats with the search counters and phase timings, truthy once solved.
+        :engine=None: (default) "bitmask" for a standard 9x9 board, otherwise "dlx"
+        :engine="bitmask": constraint propagation over candidate bitmasks, see bitmask.py (standard 9x9 boards only)
+        :engine="dlx": exact cover with Algorithm X, see dlx.py (any box size and extra units)
+        :engine="backtrack": the original cell-by-cell backtracking search
+        """
+        if not self.valid:
+            return SolverStats()
+        if engine == "backtrack":
+            stats = SolverStats()
+            start = time.perf_counter()
+            stats.solved = bool(self._solve_backtrack())
+            stats.times["search"] = time.perf_counter() - start
+            return stats
+        
+        solver = self._make_solver(engine)
+        stats = solver.solve()
+        if stats:
+            for row, solved_row in zip(self.board, solver.to_board()):
+                row[:] = solved_row
+        return stats
+
+
+    def count_solutions(self, limit=2, engine=None):
+        """ Count the solutions of the board (which is left unchanged), stopping as soon as :limit: have been found. """
+        if not self.valid:
+            return 0
+        return self._make_solver(engine).count_solutions(limit=limit)
+
+
+    def _make_solver(self, engine=None):
+        """ Internal method - build the solver for the given :engine: name (see solve) """
+        if engine is None:
+            engine = "bitmask" if self.size == 9 and not self.extra_units else "dlx"
+        if engine == "bitmask":
+            if self.size != 9 or self.extra_units:
+                raise ValueError("the bitmask engine only supports standard 9x9 boards")
+            return BitmaskSolver.from_board(self.board)
+        if engine == "dlx":
+            return ExactCoverSolver.from_board(self.board, extra_units=self.extra_units)
+        raise ValueError(f"unknown engine {engine!r}")
+
+
+    def _solve_backtrack(self):
         """
         Solve the board.
         Start by finding the next empty spot iterating through guesses 1-9. If a guess would be a valid entry, place it on the board and recurse.
@@ -87,14 +163,20 @@ class SudokuBoard():
         if row is None:
             return True
         
-        for guess in range(1,10):
+        for guess in range(1,self.size+1):
             if self.is_guess_valid(row, col, guess):
                 self.board[row][col] = guess
-                if self.solve():
+                if self._solve_backtrack():
                     return True
             self.board[row][col] = 0
 
 
+def parse_line(line):
+    """ Turn an 81-character :line: (digits, with 0 or . for blanks) into a list of 9 lists of 9 ints """
+    values = [0 if c in "0." else int(c) for c in line.strip()]
+    return [values[r*9:r*9 + 9] for r in range(9)]
+
+
 
 if __name__ == "__main__":
     layout = [
@@ -110,5 +192,6 @@ if __name__ == "__main__":
     ]
     board = SudokuBoard(layout)
     print("Original:\n", board)
-    board.solve()
+    stats = board.solve()
     print("Solved:\n", board)
+    print(stats)
@@ -0,0 +1,122 @@
+""" Solve batches of 9x9 boards held in an (N, 9, 9) NumPy array, propagating candidates for every board at once. """
+from bitmask import BitmaskSolver
+
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    print("!! Module not found. Please install numpy to use the vectorized solver.")
+
+
+ALL_DIGITS = 0b111111111 # bit (d-1) is set when digit d is still available
+
+
+def _single_digits():
+    """ Lookup table from a candidate bitmask to its digit if exactly one bit is set, else 0 """
+    table = np.zeros(ALL_DIGITS + 1, dtype=np.uint8)
+    for d in range(9):
+        table[1 << d] = d + 1
+    return table
+
+
+def _digit_bits():
+    """ Lookup table from a cell value to its digit bit (0 for blanks and out-of-range values) """
+    table = np.zeros(256, dtype=np.uint16)
+    for d in range(1, 10):
+        table[d] = 1 << (d - 1)
+    return table
+
+
+def _units(a):
+    """ The (n, 9, 9) per-cell array :a: viewed as rows, columns and boxes - each (n, unit, cell in unit) """
+    n = len(a)
+    return a, a.transpose(0, 2, 1), a.reshape(n, 3, 3, 3, 3).transpose(0, 1, 3, 2, 4).reshape(n, 9, 9)
+
+
+def _to_cells(rows, cols, boxes):
+    """ Broadcast per-unit values (n, 9) for rows, columns and boxes back to every cell (n, 9, 9) and OR them together """
+    n = len(rows)
+    box_cells = np.broadcast_to(boxes.reshape(n, 3, 1, 3, 1), (n, 3, 3, 3, 3)).reshape(n, 9, 9)
+    return rows[:, :, None] | cols[:, None, :] | box_cells
+
+
+def _once_twice(masks):
+    """ Along the last axis of :masks:, the bits seen at least once and the bits seen at least twice """
+    prefix = np.bitwise_or.accumulate(masks, axis=-1)
+    twice = np.bitwise_or.reduce(masks[..., 1:] & prefix[..., :-1], axis=-1)
+    return prefix[..., -1], twice
+
+
+def propagate(boards):
+    """
+    Fill naked and hidden singles on every board of the (N, 9, 9) :boards: array until none of them change.
+    Returns the filled copy of the boards and a bool mask (N,) of the boards found to have no solution.
+    Boards that are neither solved nor failed still have blanks (0) and need a search to finish.
+    """
+    values = np.array(boards, dtype=np.uint8, copy=True)
+    failed = (values > 9).any(axis=(1, 2))
+    singles = _single_digits()
+    digit_bits = _digit_bits()
+
+    active = np.flatnonzero(~failed)
+    while len(active):
+        current = values[active]
+        empty = current == 0
+        bits = digit_bits[current]
+
+        # used digits per unit, and whether any unit holds the same digit twice
+        used, clash = [], np.zeros(len(active), dtype=bool)
+        for unit_bits in _units(bits):
+            once, twice = _once_twice(unit_bits)
+            used.append(once)
+            clash |= (twice != 0).any(axis=1)
+        candidates = np.where(empty, ALL_DIGITS & ~_to_cells(*used), 0).astype(np.uint16)
+
+        # hidden singles - digits with exactly one possible cell in a unit
+        unit_singles, stuck = [], np.zeros(len(active), dtype=bool)
+        for unit_candidates, unit_used in zip(_units(candidates), used):
+            once, twice = _once_twice(unit_candidates)
+            unit_singles.append(once & ~twice)
+            stuck |= ((once | unit_used) != ALL_DIGITS).any(axis=1) # a digit with nowhere to go
+        hidden = candidates & _to_cells(*unit_singles)
+
+        naked = singles[candidates]
+        hidden_digit = singles[hidden]
+        bad = (
+            clash | stuck |
+            (empty & (candidates == 0)).any(axis=(1, 2)) | # a blank with no candidates
+            ((hidden != 0) & (hidden_digit == 0)).any(axis=(1, 2)) # a blank that is the only home for two digits
+        )
+
+        place = np.where(naked > 0, naked, hidden_digit)
+        changed = (place > 0).any(axis=(1, 2)) & ~bad
+        values[active] = current + place * changed[:, None, None]
+        failed[active[bad]] = True
+
+        # boards that changed go round again, which also checks the last placements of a newly full board for clashes
+        active = active[changed]
+
+    return values, failed
+
+
+def solve_batch(boards):
+    """
+    Solve every board in the (N, 9, 9) uint8 :boards: array (0 for blanks).
+    Candidate elimination and single propagation run across all boards at once; only the boards still unfinished afterwards
+    are handed to the BitmaskSolver one by one.
+    Returns an (N, 9, 9) uint8 array of solutions (unsolvable boards are left as given) and a bool status mask (N,) of the boards that were solved.
+    """
+    boards = np.asarray(boards, dtype=np.uint8)
+    if boards.ndim != 3 or boards.shape[1:] != (9, 9):
+        raise ValueError(f"boards should have shape (N, 9, 9), got {boards.shape}")
+
+    values, failed = propagate(boards)
+    solved = ~failed & (values > 0).all(axis=(1, 2))
+
+    for i in np.flatnonzero(~failed & ~solved):
+        solver = BitmaskSolver(values[i].ravel().tolist())
+        if solver.solve():
+            values[i] = np.array(solver.cells, dtype=np.uint8).reshape(9, 9)
+            solved[i] = True
+
+    solutions = np.where(solved[:, None, None], values, boards)
+    return solutions, solved
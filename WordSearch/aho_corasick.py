@@ -0,0 +1,59 @@
+""" Aho-Corasick automaton - find every occurrence of many patterns in one pass over a string. """
+from collections import deque
+
+
+class Automaton():
+    """
+    Build once from a list of :patterns:, then call matches(text) for each string to search.
+    States are numbered from 0 (the root). Each state has a dict of character transitions, a failure link to the state for
+    its longest proper suffix that is also a prefix of some pattern, and the lengths of the patterns that end there.
+    """
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]] # lengths of the patterns ending at each state
+        for pattern in set(patterns):
+            if pattern:
+                self._add(pattern)
+        self._link()
+
+
+    def _add(self, pattern):
+        """ Add :pattern: to the trie of states """
+        state = 0
+        for char in pattern:
+            nxt = self.goto[state].get(char)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+                self.goto[state][char] = nxt
+            state = nxt
+        self.out[state].append(len(pattern))
+
+
+    def _link(self):
+        """ Set the failure links breadth-first, and merge in the patterns that end at each state's failure state """
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[nxt] = self.goto[fallback].get(char, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+
+    def matches(self, text):
+        """ Yield (start, end) index pairs (end inclusive) for every pattern occurrence in :text: """
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length in out[state]:
+                yield end - length + 1, end
@@ -0,0 +1,44 @@
+import random
+import time
+from string import ascii_uppercase
+
+from word_search import Puzzle
+
+
+def random_puzzle(size, words=1000, seed=0):
+    """
+    Build a :size: x :size: grid of random letters, and a bank of :words: words cut out of it in random directions
+    (so every bank word is found at least once). Returns the grid string and the word bank.
+    """
+    rnd = random.Random(seed)
+    grid = [[rnd.choice(ascii_uppercase) for _ in range(size)] for _ in range(size)]
+    bank = set()
+    while len(bank) < words:
+        deltay, deltax = rnd.choice([(0,1), (1,0), (1,1), (-1,1), (0,-1), (-1,0), (-1,-1), (1,-1)])
+        length = rnd.randint(4, 10)
+        y, x = rnd.randrange(size), rnd.randrange(size)
+        end_y, end_x = y + deltay*(length-1), x + deltax*(length-1)
+        if 0 <= end_y < size and 0 <= end_x < size:
+            bank.add("".join(grid[y + deltay*k][x + deltax*k] for k in range(length)))
+    return "\n".join(" ".join(row) for row in grid), sorted(bank)
+
+
+def time_engine(grid, bank, engine):
+    """ Build the puzzle and find the words with the given :engine:, returning (seconds, words found) """
+    start = time.perf_counter()
+    if engine == "numpy":
+        from numpy_grid import NumpyPuzzle
+        found = NumpyPuzzle(grid, bank).find_words()
+    else:
+        found = Puzzle(grid, bank).find_words(engine=engine)
+    return time.perf_counter() - start, len(found)
+
+
+if __name__ == "__main__":
+    for size in [50, 100, 200, 400, 800, 1000]:
+        grid, bank = random_puzzle(size)
+        for engine in ["scan", "lines", "numpy"]:
+            if engine == "scan" and size > 200:
+                continue # too slow to be worth waiting for
+            elapsed, found = time_engine(grid, bank, engine)
+            print(f"{size:>5}x{size:<5} {engine:<6} {elapsed:8.3f}s  ({found:,} words found, {elapsed / size**2 * 1e6:.2f} us/cell)")
@@ -0,0 +1,191 @@
+""" Generate word-search puzzles from a word bank, written in the :Puzzle: / :Word Bank: format that parse_input reads. """
+import argparse
+import os
+import random
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from string import ascii_uppercase
+
+from word_search import DIRECTIONS, Puzzle
+
+
+def check_bank(bank):
+    """ Raise ValueError for bank words the puzzle format can't hold - parse_input needs at least 2 letters, and nothing but letters """
+    for word in bank:
+        if len(word) < 2 or not word.isalpha():
+            raise ValueError(f"bank words must be at least 2 letters, with no spaces or punctuation: {word!r}")
+
+
+def place_words(words, height, width, rnd, tries=100, budget=5000):
+    """
+    Place :words: (upper case) on an empty :height: x :width: grid, with backtracking.
+    Each word gets up to :tries: random (start, direction) placements; a placement fits if every cell it covers is empty or
+    already holds the same letter, so words can overlap. When none fits, the previous word is moved instead.
+    Returns (cells, placements) - a flat list of letters (None for the cells left empty) and a list of (word, (y,x) cells) -
+    or None if :budget: placements were tried without fitting every word.
+    """
+    cells = [None] * (height * width)
+    placements = []
+    attempts = 0
+
+    def place(i):
+        nonlocal attempts
+        if i == len(words):
+            return True
+        word = words[i]
+        for _ in range(tries):
+            attempts += 1
+            if attempts > budget:
+                return False
+            deltay, deltax = rnd.choice(DIRECTIONS)
+            y, x = rnd.randrange(height), rnd.randrange(width)
+            end_y, end_x = y + deltay*(len(word)-1), x + deltax*(len(word)-1)
+            if not (0 <= end_y < height and 0 <= end_x < width):
+                continue
+            covered = [(y + deltay*k) * width + x + deltax*k for k in range(len(word))]
+            if any(cells[c] is not None and cells[c] != char for c, char in zip(covered, word)):
+                continue
+
+            written = [c for c in covered if cells[c] is None]
+            for c, char in zip(covered, word):
+                cells[c] = char
+            placements.append((word, [divmod(c, width) for c in covered]))
+            if place(i + 1):
+                return True
+            placements.pop()
+            for c in written:
+                cells[c] = None
+        return False
+
+    if not place(0):
+        return None
+    return cells, placements
+
+
+def segment(start, end):
+    """ The set of (y,x) cells on the straight line from the (x,y) :start: to the (x,y) :end:, as find_words reports them """
+    (start_x, start_y), (end_x, end_y) = start, end
+    steps = max(abs(end_y - start_y), abs(end_x - start_x))
+    deltay = (end_y > start_y) - (end_y < start_y)
+    deltax = (end_x > start_x) - (end_x < start_x)
+    return set((start_y + deltay*k, start_x + deltax*k) for k in range(steps + 1))
+
+
+def fill(cells, placements, bank, height, width, rnd, repairs=20):
+    """
+    Fill the empty :cells: with random letters, then make sure the bank words appear only where they were placed.
+    A bank word found over any filler cell has those filler cells re-drawn, up to :repairs: times.
+    A match lying inside a single placed word (a bank word that's part of another) can't be avoided and is allowed.
+    Returns the grid as a list of row strings, or None if an unintended word couldn't be removed.
+    """
+    filler = [c for c, char in enumerate(cells) if char is None]
+    for c in filler:
+        cells[c] = rnd.choice(ascii_uppercase)
+    filler = set(divmod(c, width) for c in filler)
+    placed = [set(coords) for _, coords in placements]
+
+    for _ in range(repairs + 1):
+        rows = ["".join(cells[y*width:(y+1)*width]) for y in range(height)]
+        redraw = set()
+        for _, start, end in Puzzle("\n".join(rows), bank).find_words(engine="lines"):
+            coords = segment(start, end)
+            if any(coords <= p for p in placed):
+                continue
+            stray = coords & filler
+            if not stray:
+                return None # made entirely of placed letters - only a new layout will get rid of it
+            redraw |= stray
+        if not redraw:
+            return rows
+        for y, x in redraw:
+            cells[y*width + x] = rnd.choice(ascii_uppercase)
+    return None
+
+
+def format_puzzle(rows, bank):
+    """ The puzzle as text in the :Puzzle: / :Word Bank: format, letters separated by spaces """
+    grid = "\n".join(" ".join(row) for row in rows)
+    words = "\n".join(bank)
+    return f":Puzzle:\n{grid}\n\n:Word Bank:\n{words}\n"
+
+
+def generate(bank, height, width=None, seed=None, attempts=50):
+    """
+    Generate one puzzle hiding every word of :bank: in a :height: x :width: grid (square if :width: is None).
+    :seed: anything random.Random accepts, so the same seed always gives the same puzzle
+    Words are placed longest first, since the short ones are the easiest to fit around the rest.
+    Returns the puzzle text (see format_puzzle), or None if no layout worked after :attempts: tries.
+    """
+    check_bank(bank)
+    width = width or height
+    rnd = random.Random(seed)
+    words = sorted(set(b.upper() for b in bank), key=len, reverse=True)
+    for _ in range(attempts):
+        layout = place_words(words, height, width, rnd)
+        if layout is None:
+            continue
+        rows = fill(*layout, bank, height, width, rnd)
+        if rows is not None:
+            return format_puzzle(rows, bank)
+    return None
+
+
+def _generate_chunk(args):
+    """ Worker entry point - generate the puzzles for a list of seeds """
+    seeds, bank, height, width = args
+    return [generate(bank, height, width, seed=seed) for seed in seeds]
+
+
+def generate_many(bank, count, height, width=None, seed=0, workers=None, chunk_size=20):
+    """
+    Yield :count: puzzles for the same :bank: from :workers: processes, in order. Each puzzle's seed is its index appended
+    to :seed: (f"{seed}-{i}"), so the same arguments give the same puzzles however the work is split.
+    Chunks of seeds are only made as the pool has room for them - at most two per worker are pending - so a huge :count:
+    costs no more memory than a small one.
+    """
+    check_bank(bank)
+    workers = workers or os.cpu_count() or 1
+    chunks = (
+        ([f"{seed}-{i}" for i in range(start, min(start + chunk_size, count))], bank, height, width)
+        for start in range(0, count, chunk_size)
+    )
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_generate_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate word-search puzzles in the :Puzzle: / :Word Bank: format, separated by blank lines.")
+    parser.add_argument("bank", help="file of bank words, one per line")
+    parser.add_argument("-n", "--count", type=int, default=10, help="number of puzzles to generate")
+    parser.add_argument("--size", type=int, default=15, help="grid height (and width, unless --width is given)")
+    parser.add_argument("--width", type=int, default=None, help="grid width")
+    parser.add_argument("-s", "--seed", default="0", help="seed for reproducible output")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="number of worker processes (default: cpu count)")
+    parser.add_argument("-o", "--output", help="file to write puzzles to (default: stdout)")
+    args = parser.parse_args()
+
+    with open(args.bank) as f:
+        bank = [w.strip() for w in f if w.strip() != ""]
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    start = time.perf_counter()
+    made = 0
+    for puzzle in generate_many(bank, args.count, args.size, args.width, seed=args.seed, workers=args.workers):
+        if puzzle is None:
+            print("!! Couldn't fit the word bank into the grid - try a bigger --size", file=sys.stderr)
+            continue
+        out.write(puzzle + "\n")
+        made += 1
+    if out is not sys.stdout:
+        out.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Generated {made:,} puzzles in {elapsed:.2f}s ({made / elapsed * 60:,.0f} puzzles/min)", file=sys.stderr)
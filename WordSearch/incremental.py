@@ -0,0 +1,168 @@
+""" An editable word search - keep the solution up to date as words and cells change, without solving the whole grid again. """
+from word_search import DIRECTIONS, END, Puzzle, SCANS
+
+
+class EditablePuzzle(Puzzle):
+    """
+    A Puzzle that is solved once up front, then kept solved through add_word, remove_word and set_cell.
+    The results are always the same as a new Puzzle(...).find_words() on the edited grid and bank would give.
+    Alongside the Puzzle state it keeps:
+    - positions: each letter's set of (y,x) cells, so a new word is only looked for from the cells holding its first letter
+    - the current matches, keyed by their (x,y) start and end along the scan direction, and which matches cover each cell
+    - found_mask: a list of lists of bools, True for the cells of found words, updated cell by cell as matches come and go
+    """
+    def __init__(self, grid: str, word_bank: list):
+        super().__init__(grid, word_bank)
+        self.bank = list(self.bank) # edited in place, so don't share the caller's list
+        self._words = set(b.upper() for b in self.bank)
+        self._longest = max(map(len, self._words), default=0)
+        self.positions = {}
+        for y, row in enumerate(self.grid):
+            for x, char in enumerate(row):
+                self.positions.setdefault(char, set()).add((y,x))
+
+        self.found_mask = [[False] * len(row) for row in self.grid]
+        self._matches = {} # (start, end) -> word
+        self._cells = {} # (start, end) -> the (y,x) cells of the match
+        self._by_word = {} # word -> set of (start, end) keys
+        self._by_cell = {} # (y,x) -> set of (start, end) keys of the matches covering it
+        for word, start, end in super().find_words():
+            self._add_match(start, end, word)
+        self._found_coords = []
+
+
+    @property
+    def found(self):
+        """ The current matches as a sorted list of (word, (x,y) start, (x,y) end) tuples, as find_words returns them """
+        return sorted(tuple([word, start, end]) for (start, end), word in self._matches.items())
+
+
+    def find_words(self, engine="scan"):
+        """ The matches are always up to date, so there's nothing to search - returns found """
+        return self.found
+
+
+    def _found_cells(self):
+        """ The set of (y,x) coordinates of the cells contained in found words (a live view of the match index) """
+        return self._by_cell.keys()
+
+
+    def _add_match(self, start, end, word):
+        """ Record :word: as found between the (x,y) :start: and :end: - or re-attribute the match if it's already known """
+        key = (start, end)
+        if key in self._matches:
+            self._by_word[self._matches[key]].discard(key)
+        else:
+            (start_x, start_y), (end_x, end_y) = start, end
+            steps = max(abs(end_y - start_y), abs(end_x - start_x))
+            deltay = (end_y > start_y) - (end_y < start_y)
+            deltax = (end_x > start_x) - (end_x < start_x)
+            cells = [(start_y + deltay*k, start_x + deltax*k) for k in range(steps + 1)]
+            self._cells[key] = cells
+            for y, x in cells:
+                self._by_cell.setdefault((y,x), set()).add(key)
+                self.found_mask[y][x] = True
+        self._matches[key] = word
+        self._by_word.setdefault(word, set()).add(key)
+
+
+    def _remove_match(self, key):
+        """ Forget the match under :key:, clearing the mask for cells no other match covers """
+        self._by_word[self._matches.pop(key)].discard(key)
+        for y, x in self._cells.pop(key):
+            covering = self._by_cell[(y,x)]
+            covering.discard(key)
+            if not covering:
+                del self._by_cell[(y,x)]
+                self.found_mask[y][x] = False
+
+
+    def add_word(self, word):
+        """
+        Add :word: to the bank, and find it by reading from the cells that hold its first letter in all 8 directions.
+        Where the word shares a match with the reverse of a bank word, the word read along the scan direction wins, as with find_words.
+        """
+        self.bank.append(word)
+        word = word.upper()
+        if word in self._words:
+            self.bank.pop()
+            return
+        self._words.add(word)
+        self._longest = max(self._longest, len(word))
+        self._add_to_trie(self._trie, word)
+        self._add_to_trie(self._reversed_trie, self._reverse(word))
+
+        for y, x in self.positions.get(word[:1], ()):
+            for deltay, deltax in DIRECTIONS:
+                if any(self._look_coord(y + k*deltay, x + k*deltax) != char for k, char in enumerate(word)):
+                    continue
+                self._counter += len(word)
+                end_y, end_x = y + (len(word)-1)*deltay, x + (len(word)-1)*deltax
+                if (deltay, deltax) in SCANS:
+                    self._add_match((x,y), (end_x, end_y), word)
+                elif ((end_x, end_y), (x,y)) not in self._matches:
+                    self._add_match((end_x, end_y), (x,y), word)
+
+
+    def remove_word(self, word):
+        """ Remove :word: from the bank, along with its matches (which go to its reverse instead, if that's also a bank word) """
+        word = word.upper()
+        if word not in self._words:
+            return
+        self.bank[:] = [b for b in self.bank if b.upper() != word]
+        self._words.discard(word)
+        self._trie = self._make_trie(self._words)
+        self._reversed_trie = self._make_trie(self._reverse(b) for b in self._words)
+
+        reverse = self._reverse(word)
+        for start, end in list(self._by_word.get(word, ())):
+            if reverse in self._words:
+                self._add_match(start, end, reverse)
+            else:
+                self._remove_match((start, end))
+        self._by_word.pop(word, None)
+
+
+    def set_cell(self, y, x, char):
+        """
+        Change the letter at :y:, :x: to :char:, and only rescan the lines through that cell.
+        The matches through the cell are dropped, then each scan direction is walked from every start close enough for a bank
+        word to reach the cell, keeping the words that cover it.
+        """
+        char = char.upper()
+        old = self.grid[y][x]
+        if char == old:
+            return
+        self.grid[y][x] = char
+        self.positions[old].discard((y,x))
+        self.positions.setdefault(char, set()).add((y,x))
+        for key in list(self._by_cell.get((y,x), ())):
+            self._remove_match(key)
+
+        for deltay, deltax in SCANS:
+            for back in range(self._longest):
+                start_y, start_x = y - back*deltay, x - back*deltax
+                if self._look_coord(start_y, start_x) is None:
+                    break # the line has left the grid
+                self._scan_through(start_y, start_x, deltay, deltax, back)
+
+
+    def _scan_through(self, y, x, deltay, deltax, skip):
+        """ Like Puzzle._scan, but only record the words that reach past the first :skip: cells, and keep them as matches """
+        node, reversed_node = self._trie, self._reversed_trie
+        for k in range(self._longest):
+            char = self._look_coord(y + k*deltay, x + k*deltax)
+            if char is None:
+                break
+            node = node.get(char) if node is not None else None
+            reversed_node = reversed_node.get(char) if reversed_node is not None else None
+            if node is None and reversed_node is None:
+                break
+            self._counter += 1
+            if k < skip:
+                continue
+            end = (x + k*deltax, y + k*deltay)
+            if node is not None and END in node:
+                self._add_match((x,y), end, node[END])
+            elif reversed_node is not None and END in reversed_node:
+                self._add_match((x,y), end, self._reverse(reversed_node[END]))
@@ -0,0 +1,126 @@
+""" A NumPy backend for huge word-search grids - one byte per cell, and every bank word matched with array operations. """
+import re
+
+from word_search import DIRECTIONS, Puzzle, SCANS
+
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    print("!! Module not found. Please install numpy to use the NumPy grid backend.")
+
+
+class NumpyPuzzle(Puzzle):
+    """
+    A Puzzle whose grid is a 2-D uint8 array of character codes (ragged rows are padded with 0, which matches nothing).
+    Cells contained in found words are kept in the bool array :found_mask: rather than a list of coordinates.
+    """
+    def __init__(self, grid: str, word_bank: list):
+        super().__init__(grid, word_bank)
+        self.found_mask = np.zeros(self.grid.shape, dtype=bool)
+
+
+    def _make_grid(self, grid_str):
+        """ Take in the :grid_str: (or the compact bytes grid from reader.read_puzzles) to create a 2-d uint8 array of character codes """
+        if isinstance(grid_str, (bytes, bytearray)):
+            rows = grid_str.split(b"\n")
+            width = max(map(len, rows))
+            if all(len(row) == width for row in rows):
+                return np.frombuffer(b"".join(rows), dtype=np.uint8).reshape(len(rows), width).copy() # no per-row work at all
+            grid = np.zeros((len(rows), width), dtype=np.uint8)
+            for y, row in enumerate(rows):
+                grid[y, :len(row)] = np.frombuffer(row, dtype=np.uint8)
+            return grid
+
+        rows = [re.sub(r"\s", "", row).upper() for row in grid_str.splitlines()]
+        rows = [row for row in rows if row != ""]
+        grid = np.zeros((len(rows), max(map(len, rows), default=0)), dtype=np.uint8)
+        for y, row in enumerate(rows):
+            grid[y, :len(row)] = self._codes(row)
+        return grid
+
+
+    def _codes(self, string):
+        """ The uint8 character codes of :string: (characters outside latin-1 become ?) """
+        return np.frombuffer(string.encode("latin-1", errors="replace"), dtype=np.uint8)
+
+
+    def _char_rows(self):
+        """ Yield the rows of the grid as strings, one at a time (ragged rows lose their padding) """
+        for row in self.grid:
+            yield row.tobytes().rstrip(b"\0").decode("latin-1")
+
+
+    def _found_cells(self):
+        """ The (y,x) coordinates of the cells contained in found words """
+        ys, xs = np.nonzero(self.found_mask)
+        return set(zip(ys.tolist(), xs.tolist()))
+
+
+    def solve(self, engine="numpy"):
+        """ Find the words to solve the puzzle, and print the result. """
+        return super().solve(engine=engine)
+
+
+    def find_words(self, engine="numpy"):
+        """
+        Find the bank words hidden in the grid. Returns a sorted list of (word, (x,y) start, (x,y) end) tuples, the same as Puzzle.find_words.
+        The words are matched one direction at a time, with array operations only:
+        - every cell and its neighbour along the direction form a two-letter code (from two shifted slices of the grid), sorted once
+        - a word's candidate starts are the cells whose code matches its first two letters, found with a binary search
+        - the candidates are then narrowed down letter by letter, so the work shrinks with every letter
+        """
+        if engine != "numpy":
+            raise ValueError(f"NumpyPuzzle only supports the 'numpy' engine, not {engine!r}")
+
+        bank = sorted(set(b.upper() for b in self.bank if b))
+        if not bank:
+            return [] # nothing to pad the grid for, or to find
+        codes =[self._codes(word) for word in bank]
+        first_pairs = np.array([int(c[0]) << 8 | int(c[1]) if len(c) > 1 else 0 for c in codes], dtype=np.uint16)
+        height, width = self.grid.shape
+        pad = max(map(len, bank), default=0)
+        padded = np.pad(self.grid, pad) # words can run off the edge without bounds checks
+
+        # matches keyed by the scan direction and ends they'd be found at by the "scan" engine, so the results line up with it -
+        # a word read against a scan direction is keyed by the opposite direction with its ends swapped
+        forward, backward = {}, {}
+        for deltay, deltax in DIRECTIONS:
+            neighbours = padded[pad+deltay:pad+deltay+height, pad+deltax:pad+deltax+width]
+            pairs = (self.grid.astype(np.uint16) << 8 | neighbours).ravel()
+            order = np.argsort(pairs, kind="stable")
+            sorted_pairs = pairs[order]
+            lows = np.searchsorted(sorted_pairs, first_pairs, "left")
+            highs = np.searchsorted(sorted_pairs, first_pairs, "right")
+
+            for word, word_codes, low, high in zip(bank, codes, lows.tolist(), highs.tolist()):
+                if len(word_codes) == 1:
+                    if (deltay, deltax) not in SCANS:
+                        continue # a single letter reads the same both ways
+                    cells = np.flatnonzero(self.grid.ravel() == word_codes[0])
+                else:
+                    cells = order[low:high]
+                ys, xs = cells // width + pad, cells % width + pad
+
+                for k in range(2, len(word_codes)):
+                    if len(ys) == 0:
+                        break
+                    self._counter += len(ys)
+                    hit = padded[ys + k*deltay, xs + k*deltax] == word_codes[k]
+                    ys, xs = ys[hit], xs[hit]
+                if len(ys) == 0:
+                    continue
+
+                for k in range(len(word_codes)):
+                    self.found_mask[ys - pad + k*deltay, xs - pad + k*deltax] = True
+
+                ys, xs = ys - pad, xs - pad
+                end_ys, end_xs = ys + (len(word_codes)-1)*deltay, xs + (len(word_codes)-1)*deltax
+                for y, x, end_y, end_x in zip(ys.tolist(), xs.tolist(), end_ys.tolist(), end_xs.tolist()):
+                    if (deltay, deltax) in SCANS:
+                        forward[((deltay, deltax), (x,y), (end_x, end_y))] = word
+                    else:
+                        backward[((-deltay, -deltax), (end_x, end_y), (x,y))] = word
+
+        # as with the "scan" engine, the word read along the scan direction wins when a word and its reverse are both in the bank
+        matches = {**backward, **forward}
+        return sorted(tuple([word, start, end]) for (_, start, end), word in matches.items())
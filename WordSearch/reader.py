@@ -0,0 +1,50 @@
+""" Stream puzzles out of large input files - memory-mapped, one pass, and one puzzle at a time. """
+import mmap
+
+
+PUZZLE = b":Puzzle:"
+WORD_BANK = b":Word Bank:"
+WHITESPACE = b" \t\r\n\v\f"
+
+
+def read_puzzles(path):
+    """
+    Lazily yield a (grid, word_bank) pair for each puzzle in the file at :path:, which can hold any number of puzzles back to back.
+    The file is memory-mapped and read line by line in a single pass, so it's never held in memory as one string.
+    Each :grid: is a compact bytearray - the upper-cased letters of each row with the whitespace taken out, rows separated by
+    b"\n" - which Puzzle and NumpyPuzzle both accept in place of the grid string.
+    :word_bank: is a list of str, as parse_input returns.
+    A section runs from its header to the next blank line (or header), and a puzzle is yielded as soon as the next one starts.
+    """
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return # mmap can't map an empty file
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from _parse(iter(mm.readline, b""))
+
+
+def _parse(lines):
+    """ The parser behind read_puzzles - yield (grid, word_bank) pairs from an iterable of byte :lines: """
+    grid, word_bank = bytearray(), []
+    section = None
+    for line in lines:
+        line = line.strip(WHITESPACE)
+        if line == PUZZLE or line == WORD_BANK:
+            # a repeated section means the previous puzzle is complete
+            if (line == PUZZLE and grid) or (line == WORD_BANK and word_bank):
+                if grid and word_bank:
+                    del grid[-1] # the last row's newline
+                    yield grid, word_bank
+                grid, word_bank = bytearray(), []
+            section = line
+        elif line == b"":
+            section = None
+        elif section == PUZZLE:
+            grid += line.translate(None, WHITESPACE).upper()
+            grid += b"\n"
+        elif section == WORD_BANK:
+            word_bank.append(line.decode())
+
+    if grid and word_bank:
+        del grid[-1]
+        yield grid, word_bank
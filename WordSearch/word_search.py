@@ -1,6 +1,24 @@
+import io
 import re
+import sys
 from itertools import zip_longest
 
+from aho_corasick import Automaton
+
+
+END = None # trie key that marks the end of a word - its value is the word itself
+
+# we only need to scan in these 4 (deltay, deltax) directions
+# the reverse of each bank word is searched as well, which accounts for the other 4 directions.
+SCANS = [
+    (0,1), # right
+    (1,0), # down
+    (1,1), # down-right
+    (-1,1) # up-right
+]
+# every direction a word can read in - the 4 scan directions, then their opposites
+DIRECTIONS = SCANS + [(-deltay, -deltax) for deltay, deltax in SCANS]
+
 
 class Puzzle():
     def __init__(self, grid: str, word_bank: list):
@@ -8,43 +26,86 @@ class Puzzle():
         self.bank = word_bank
         self._counter = 0 # count of checked words
         self._found_coords = [] # (y,x) coordinates for cells contained in found words
+        self._trie = self._make_trie(b.upper() for b in self.bank) # bank words, read forwards
+        self._reversed_trie = self._make_trie(self._reverse(b.upper()) for b in self.bank) # bank words, read backwards
     
 
     def __str__(self):
-        grid = self.grid.copy()
-        
-        # set font weight for each character (if words have been found)
-        if len(self._found_coords) > 0:
-            for y, row in enumerate(grid):
-                for x, char in enumerate(row):
-                    if (y,x) in self._found_coords:
-                        char = "\033[1m" + "\033[32m" + char.upper() + "\033[39m" + "\033[0m" # bold, green, upper, color reset, font reset
-                    else:
-                        char = "\033[2m" + char.lower() + "\033[0m" # light, lower
-                    grid[y][x] = char
-                
-        string = "\n-=  W o r d   S e a r c h  =-\n\n"
+        stream = io.StringIO()
+        self.render(stream)
+        return stream.getvalue()
+
+
+    def render(self, stream, chunk_size=1 << 16):
+        """
+        Write the pretty-printed puzzle to :stream: (anything with a write method), in chunks of about :chunk_size: characters,
+        so even huge grids print in linear time and bounded memory.
+        The found cells are grouped by row up front. Each row is then styled with str.translate through tables of the dimmed
+        glyph for every letter, and only the found cells are styled one at a time.
+        """
+        found_rows = {} # y -> sorted x of the found cells in that row
+        for y, x in self._found_cells():
+            found_rows.setdefault(y, []).append(x)
+        for xs in found_rows.values():
+            xs.sort()
+        dimmed = _Glyphs(self._dim_glyph if found_rows else str) # char code -> "  " + glyph
+        found = _Glyphs(self._found_glyph)
+
+        chunk = ["\n-=  W o r d   S e a r c h  =-\n\n"]
+        size = 0
         
-        # puzzle grid
-        for row in grid:
-            string += "\n"
-            string += "  ".join(row)
-            string += "\n"
+        # puzzle grid, with the font weight set for each character (if words have been found)
+        for y, row in enumerate(self._char_rows()):
+            row = "".join(row)
+            pieces = []
+            start = 0
+            for x in found_rows.get(y, ()):
+                pieces.append(row[start:x].translate(dimmed))
+                pieces.append(found[ord(row[x])])
+                start = x + 1
+            pieces.append(row[start:].translate(dimmed))
+            line = "\n" + "".join(pieces)[2:] + "\n"
+            chunk.append(line)
+            size += len(line)
+            if size >= chunk_size:
+                stream.write("".join(chunk))
+                chunk, size = [], 0
         
         # word bank
-        string += f"\n\nWord Bank ({len(self.bank)} words):\n"
-        max_word_lenth = max(map(len, word_bank))
-        half = len(word_bank)//2 # half way between 
-        for l, r in zip_longest(word_bank[:half], word_bank[half:]):
+        chunk.append(f"\n\nWord Bank ({len(self.bank)} words):\n")
+        max_word_lenth = max(map(len, self.bank), default=0)
+        half = len(self.bank)//2 # half way between 
+        for l, r in zip_longest(self.bank[:half], self.bank[half:]):
             if l is None: # handle the case where the right-list could be longer
                 l, r = r, ""
-            string += f"{l.ljust(int(max_word_lenth*1.5), ' ')}\t{r}\n"
-        
-        return string
+            chunk.append(f"{l.ljust(int(max_word_lenth*1.5), ' ')}\t{r}\n")
+        stream.write("".join(chunk))
+
+
+    def _found_glyph(self, char):
+        """ :char: as it's printed in a found word """
+        return "\033[1m" + "\033[32m" + char.upper() + "\033[39m" + "\033[0m" # bold, green, upper, color reset, font reset
+
+
+    def _dim_glyph(self, char):
+        """ :char: as it's printed outside the found words """
+        return "\033[2m" + char.lower() + "\033[0m" # light, lower
+
+
+    def _char_rows(self):
+        """ Yield the rows of the grid as sequences of characters, one at a time """
+        return iter(self.grid)
+
+
+    def _found_cells(self):
+        """ The set of (y,x) coordinates of the cells contained in found words """
+        return set(self._found_coords)
 
 
     def _make_grid(self, grid_str):
-        """ Take in the :grid_str: to create a 2-d list of lists """
+        """ Take in the :grid_str: (or the compact bytes grid from reader.read_puzzles) to create a 2-d list of lists """
+        if isinstance(grid_str, (bytes, bytearray)):
+            return [list(row) for row in grid_str.decode().split("\n")] # already upper-cased, one row per line
         grid = []
         for row in grid_str.splitlines():
             row = row.strip().upper()
@@ -55,6 +116,25 @@ class Puzzle():
         return grid
 
 
+    def _make_trie(self, words):
+        """
+        Build a prefix trie from the given :words: - nested dicts keyed by character.
+        The node reached by the last character of a word stores the word under the END key.
+        """
+        trie = {}
+        for word in words:
+            self._add_to_trie(trie, word)
+        return trie
+
+
+    def _add_to_trie(self, trie, word):
+        """ Add :word: to the prefix :trie: in place """
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[END] = word
+
+
     def _points_between_two_coords(self, c1: tuple, c2: tuple):
         """ Find the points including and between the two given (y,x) coordinates """
         y1,x1 = c1
@@ -94,19 +174,6 @@ class Puzzle():
         return string[::-1]
 
 
-    def _check_word(self, word):
-        """ Check if the given word is in the word bank. If yes, return the word, else return False """
-        bank = [b.upper() for b in self.bank]
-        word = word.upper()
-        self._counter += 1
-        if word in bank:
-            return word
-        elif self._reverse(word) in bank:
-            return self._reverse(word)
-        else:
-            return False
-
-
     def _scan(self, y,x, deltay, deltax):
         """ 
         Scan the grid in the specified direction.
@@ -114,18 +181,28 @@ class Puzzle():
         deltay, deltax are how many to increment for each scan. 
             e.g. to scan right, pass deltay 0, deltax 1
             e.g. scan up-right, pass deltay -1, deltax 1
-        At each step along the way, continue building the possible word string and check if it's valid against the word-bank.
+        At each step along the way, walk one character deeper into the forward and reversed tries to check the string built so far against the word-bank.
+        Stop as soon as the string isn't the start of any word (read either way), rather than running on to the edge of the grid.
         Return any words that are found.
         """
         found = []
-        word = ""
+        node, reversed_node = self._trie, self._reversed_trie
         look_y, look_x = y,x
         while True:
             char = self._look_coord(look_y, look_x)
             if char is None:
                 break
-            word += char
-            found_word = self._check_word(word)
+            node = node.get(char) if node is not None else None
+            reversed_node = reversed_node.get(char) if reversed_node is not None else None
+            if node is None and reversed_node is None:
+                break # no bank word starts (or ends) this way
+            
+            self._counter += 1
+            found_word = False
+            if node is not None and END in node:
+                found_word = node[END]
+            elif reversed_node is not None and END in reversed_node:
+                found_word = self._reverse(reversed_node[END])
             if found_word:
                 found.append(tuple([found_word, (x,y), (look_x, look_y)])) # the only place we use x,y instead of y,x as this will eventually be seen by the user
                 self._points_between_two_coords((y, x), (look_y, look_x))
@@ -134,23 +211,86 @@ class Puzzle():
         return found
          
 
-    def solve(self):
-        """ Search character-by-character to find words and solve the puzzle. """
+    def _find_scan(self):
+        """ Search character-by-character, scanning from every cell in each direction. """
         found = []
         for y, row in enumerate(self.grid):
             for x, _ in enumerate(row):
-                # we only need to scan in these 4 directions
-                # during the _check, the reverse string is searched which should account for the other 4 directions.
-                scans = [
-                    (0,1), # right
-                    (1,0), # down
-                    (1,1), # down-right
-                    (-1,1) # up-right
-                ]
-                for deltay, deltax in scans:
+                for deltay, deltax in SCANS:
                     found.extend(self._scan(y,x, deltay,deltax))
-    
+        return found
+
+
+    def _lines(self):
+        """
+        Yield every row, column, diagonal and anti-diagonal of the grid exactly once, as (y, x, deltay, deltax, string).
+        y,x is the coordinate of the first character and deltay, deltax the direction the string reads in (see SCANS).
+        A line starts at each cell whose previous cell in that direction is off the grid, so ragged rows are handled too.
+        """
+        rows = ["".join(row) for row in self.grid]
+        widths = [len(row) for row in rows]
+        height = len(rows)
+        for deltay, deltax in SCANS:
+            for y, width in enumerate(widths):
+                # with deltax of 0 or 1, the cells of this row whose previous cell is off the grid are the first deltax cells,
+                # and the ones past the end of the previous row
+                prev_y = y - deltay
+                if 0 <= prev_y < height:
+                    starts = list(range(0, min(deltax, width))) + list(range(widths[prev_y] + deltax, width))
+                else:
+                    starts = range(width)
+
+                for x in starts:
+                    chars = []
+                    look_y, look_x = y, x
+                    while 0 <= look_y < height and look_x < widths[look_y]:
+                        chars.append(rows[look_y][look_x])
+                        look_y += deltay
+                        look_x += deltax
+                    yield y, x, deltay, deltax, "".join(chars)
+
+
+    def _find_lines(self):
+        """
+        Pull out each line of the grid once and run a single Aho-Corasick automaton over it for every bank word and its reverse,
+        then map the match offsets back to (x,y) coordinates.
+        """
+        bank = set(b.upper() for b in self.bank)
+        automaton = Automaton(list(bank) + [self._reverse(b) for b in bank])
+
+        found = []
+        for y, x, deltay, deltax, line in self._lines():
+            self._counter += len(line)
+            for start, end in automaton.matches(line):
+                word = line[start:end+1]
+                if word not in bank:
+                    word = self._reverse(word)
+                start_y, start_x = y + start*deltay, x + start*deltax
+                end_y, end_x = y + end*deltay, x + end*deltax
+                found.append(tuple([word, (start_x, start_y), (end_x, end_y)]))
+                self._points_between_two_coords((start_y, start_x), (end_y, end_x))
+        return found
+
+
+    def find_words(self, engine="scan"):
+        """
+        Find the bank words hidden in the grid. Returns a sorted list of (word, (x,y) start, (x,y) end) tuples.
+        :engine="scan": (default) walk from every cell in each direction, pruned by the bank's prefix tries
+        :engine="lines": extract every line of the grid once and match the whole bank against it with Aho-Corasick - for very large grids
+        """
+        if engine == "scan":
+            found = self._find_scan()
+        elif engine == "lines":
+            found = self._find_lines()
+        else:
+            raise ValueError(f"unknown engine {engine!r}")
         found.sort()
+        return found
+
+
+    def solve(self, engine="scan"):
+        """ Find the words (see find_words for the :engine: options) to solve the puzzle, and print the result. """
+        found = self.find_words(engine=engine)
         found_string_parts = []
         found_string_parts.append(f"Found {'all ' if len(found) >= len(self.bank) else ''}{len(found) if len(found) <= len(self.bank) else len(self.bank)} words in {self._counter*2:,} searches:")
         for f in found:
@@ -163,11 +303,24 @@ class Puzzle():
         
         found_string = "\n".join(found_string_parts)
         
-        print(self)
+        self.render(sys.stdout)
+        sys.stdout.write("\n")
         print(found_string)
         return found_string
 
 
+class _Glyphs(dict):
+    """ A str.translate table that builds each character's entry on first use - two spaces, then :style: applied to the character """
+    def __init__(self, style):
+        super().__init__()
+        self.style = style
+
+
+    def __missing__(self, code):
+        glyph = self[code] = "  " + self.style(chr(code))
+        return glyph
+
+
 def parse_input(inpt: str): 
     """ Parse the given :inpt: in order to extract the puzzle grid and the word bank. """
     # grid
@@ -183,10 +336,8 @@ def parse_input(inpt: str):
 
 
 if __name__ == "__main__":
-    with open("input.txt") as f:
-        inpt = f.read().strip()
-
-    grid, word_bank = parse_input(inpt)
+    from reader import read_puzzles
 
-    p = Puzzle(grid, word_bank)
-    p.solve()
+    for grid, word_bank in read_puzzles("input.txt"):
+        p = Puzzle(grid, word_bank)
+        p.solve()
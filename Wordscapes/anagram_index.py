@@ -0,0 +1,164 @@
+""" Index dictionary words by their letters, to find every word a Wordscapes wheel can spell without trying permutations. """
+import re
+from collections import Counter
+from itertools import combinations
+from math import comb
+
+
+def signature(letters):
+    """ The sorted, upper-cased letters of :letters: - every anagram of a word has the same signature """
+    return "".join(sorted(letters.upper()))
+
+
+def _set_bits(bits):
+    """ The positions of the set bits of the int :bits:, lowest first """
+    if bits.bit_count() <= 256:
+        positions = []
+        while bits:
+            low = bits & -bits
+            positions.append(low.bit_length() - 1)
+            bits ^= low
+        return positions
+    # for many bits, one pass of a regex over the binary digits beats a bigint operation per bit
+    return [match.start() for match in re.finditer("1", bin(bits)[:1:-1])]
+
+
+def letter_mask(letters):
+    """ A bitmask with bit 0 set for A, bit 1 for B... for each distinct A-Z letter in :letters: (anything else is ignored) """
+    mask = 0
+    for char in letters:
+        if "A" <= char <= "Z":
+            mask |= 1 << (ord(char) - 65)
+    return mask
+
+
+class AnagramIndex():
+    """
+    Words grouped by length, then by signature (their letter multiset), with a letter bitmask and the highest count of any one
+    letter per signature.
+    lookup(bank, length) finds the words that can be spelled from the letters of :bank: in one of two ways, whichever is cheaper:
+    - small banks: look up each distinct :length: letter sub-multiset of the bank's signature (at most 35 for a 7-letter wheel)
+    - big banks: scan the signatures of that length, skipping any that use a letter outside the bank's bitmask before
+      comparing letter counts - which is only needed when the signature repeats a letter more often than the bank's rarest one
+    """
+    def __init__(self, words=()):
+        self._by_length = {} # length -> {signature: [words]}
+        self._masks = {} # signature -> (letter_mask, highest count of a single letter)
+        self._patterns = {} # length -> positional postings, built by _postings on first use
+        for word in words:
+            self.add(word)
+
+
+    def add(self, word):
+        """ Index :word: (upper-cased). Anything that isn't all A-Z letters is skipped. """
+        word = word.upper()
+        if not (word.isascii() and word.isalpha()):
+            return
+        sig = signature(word)
+        words = self._by_length.setdefault(len(word), {}).setdefault(sig, [])
+        if word not in words:
+            words.append(word)
+            self._masks[sig] = (letter_mask(sig), max(Counter(sig).values()))
+            self._patterns.pop(len(word), None) # rebuilt with the new word next time
+
+
+    def __contains__(self, word):
+        """ Whether :word: (in any case) is indexed """
+        word = word.upper()
+        return word in self._anagrams(len(word), signature(word))
+
+
+    def lookup(self, bank, length):
+        """ A sorted list of the distinct indexed words of :length: letters that use each letter of :bank: at most as often as it appears """
+        bank = signature(bank)
+        found = []
+        if comb(len(bank), length) <= self._signature_count(length):
+            for letters in set(combinations(bank, length)):
+                found.extend(self._anagrams(length, "".join(letters)))
+        else:
+            bank_mask, bank_counts = letter_mask(bank), Counter(bank)
+            rarest = min(bank_counts.values(), default=0)
+            for sig, mask, highest, words in self._groups(length):
+                if mask & ~bank_mask:
+                    continue
+                if highest <= rarest or Counter(sig) <= bank_counts:
+                    found.extend(words)
+        return sorted(found)
+
+
+    def match(self, template, bank=None):
+        """
+        A sorted list of the distinct indexed words that fit :template: - letters where they're known, "_" for the blanks, so
+        "__T" or "A__LE" - and that can be spelled from the letters of :bank:, if it's given.
+        Everything is done by intersecting posting bitsets (see _postings), so the cost follows the number of words returned:
+        each known letter keeps the words with that letter at that position, and each letter of the alphabet keeps the words
+        that use it no more often than the bank has it.
+        """
+        template = template.upper()
+        length = len(template)
+        fixed = [(i, char) for i, char in enumerate(template) if char != "_"]
+        if not fixed and bank is not None:
+            return self.lookup(bank, length) # nothing to intersect - the anagram lookup is quicker
+
+        words, at, at_most = self._postings(length)
+        bits = (1 << len(words)) - 1
+        for i, char in fixed:
+            bits &= at.get((i, char), 0)
+        if bank is not None:
+            bank_counts = Counter(bank.upper())
+            for char, allowed in at_most.items():
+                count = bank_counts[char]
+                if count < len(allowed):
+                    bits &= allowed[count]
+        return sorted(words[i] for i in _set_bits(bits))
+
+
+    def _postings(self, length):
+        """
+        The positional index for words of :length: letters, built the first time it's needed and kept:
+        (words, {(position, letter): bitset}, {letter: [bitset of the words using it at most 0, 1, ... times]}),
+        where bit i of a bitset stands for words[i]. A letter's list stops short of the most any word uses it, since from
+        there on every word qualifies.
+        """
+        if length not in self._patterns:
+            words = [word for _, _, _, group in self._groups(length) for word in group]
+            size = (len(words) + 7) // 8
+            at, exactly = {}, {}
+            for i, word in enumerate(words):
+                byte, bit = i >> 3, 1 << (i & 7)
+                for position, char in enumerate(word):
+                    at.setdefault((position, char), bytearray(size))[byte] |= bit
+                for char, count in Counter(word).items():
+                    counts = exactly.setdefault(char, [])
+                    while len(counts) < count:
+                        counts.append(bytearray(size))
+                    counts[count - 1][byte] |= bit
+
+            every = (1 << len(words)) - 1
+            at_most = {}
+            for char, counts in exactly.items():
+                allowed = [every]
+                for bitmap in reversed(counts): # peel off the words using the letter n times, from the most frequent down
+                    allowed.append(allowed[-1] & ~int.from_bytes(bitmap, "little"))
+                at_most[char] = allowed[:0:-1]
+            self._patterns[length] = (words, {key: int.from_bytes(bitmap, "little") for key, bitmap in at.items()}, at_most)
+        return self._patterns[length]
+
+
+    # the storage behind lookup - see dictionary.CompiledDictionary for the on-disk version
+
+    def _signature_count(self, length):
+        """ The number of distinct signatures of :length: letters """
+        return len(self._by_length.get(length, {}))
+
+
+    def _anagrams(self, length, sig):
+        """ The words of :length: letters with the signature :sig: """
+        return self._by_length.get(length, {}).get(sig, ())
+
+
+    def _groups(self, length):
+        """ Yield (signature, letter_mask, highest letter count, words) for each signature of :length: letters """
+        masks = self._masks
+        for sig, words in self._by_length.get(length, {}).items():
+            yield (sig, *masks[sig], words)
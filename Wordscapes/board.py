@@ -0,0 +1,154 @@
+""" Solve a whole Wordscapes level at once - every slot of the crossword, with the crossings constraining each other. """
+
+
+ACROSS, DOWN = "across", "down"
+
+
+class Board():
+    """
+    A Wordscapes level: the letters of the :wheel: and the crossword :grid: - a list of strings (or one string of lines) with
+    "_" for a hidden cell, a letter for a revealed one, and "." or a space for no cell.
+    Every across or down run of at least :min_length: cells is a slot, keyed by its (y, x, direction) - the first cell and
+    ACROSS or DOWN. Each slot starts with the words of its length that fit its revealed letters and that the wheel can spell,
+    from :dictionary: (anything with the AnagramIndex.match method).
+    """
+    def __init__(self, wheel, grid, dictionary, min_length=3):
+        self.wheel = wheel.upper()
+        if isinstance(grid, str):
+            grid = grid.splitlines()
+        self.grid = [row.upper() for row in grid]
+        self.slots = self._find_slots(min_length) # (y, x, direction) -> list of (y,x) cells
+        self.crossings = self._find_crossings() # slot -> list of (position in slot, other slot, position in other slot)
+        self.domains = {
+            slot: dictionary.match("".join(self._cell(y,x) for y, x in cells), self.wheel)
+            for slot, cells in self.slots.items()
+        }
+        self.nodes = 0 # slots guessed by the search
+
+
+    def _cell(self, y, x):
+        """ The character at :y:, :x: - "_" for a hidden cell, or None if there's no cell there """
+        if 0 <= y < len(self.grid) and 0 <= x < len(self.grid[y]):
+            char = self.grid[y][x]
+            if char not in ". ":
+                return char
+        return None
+
+
+    def _find_slots(self, min_length):
+        """ Every maximal across and down run of at least :min_length: cells """
+        slots = {}
+        for y, row in enumerate(self.grid):
+            for x in range(len(row)):
+                for direction, deltay, deltax in ((ACROSS, 0, 1), (DOWN, 1, 0)):
+                    if self._cell(y, x) is None or self._cell(y - deltay, x - deltax) is not None:
+                        continue # not the start of a run
+                    cells = []
+                    while self._cell(y + len(cells)*deltay, x + len(cells)*deltax) is not None:
+                        cells.append((y + len(cells)*deltay, x + len(cells)*deltax))
+                    if len(cells) >= min_length:
+                        slots[(y, x, direction)] = cells
+        return slots
+
+
+    def _find_crossings(self):
+        """ For each slot, the cells it shares with other slots """
+        at = {} # (y,x) -> list of (slot, position)
+        for slot, cells in self.slots.items():
+            for i, cell in enumerate(cells):
+                at.setdefault(cell, []).append((slot, i))
+        crossings = {slot: [] for slot in self.slots}
+        for sharing in at.values():
+            for slot, i in sharing:
+                for other, j in sharing:
+                    if other != slot:
+                        crossings[slot].append((i, other, j))
+        return crossings
+
+
+    def _propagate(self, domains, queue):
+        """
+        Make :domains: arc consistent, starting from the slots in :queue:, and keep the words of the board distinct.
+        A slot's words must have, at each crossing, a letter some word of the crossing slot has there; whenever a slot's
+        words change, the slots crossing it are checked again. A slot down to one word takes that word from every other slot.
+        Returns False as soon as a slot runs out of words.
+        """
+        queue = list(queue)
+        queued = set(queue)
+        while queue:
+            changed = queue.pop()
+            queued.discard(changed)
+            if len(domains[changed]) == 1:
+                word = domains[changed][0]
+                for slot, words in domains.items():
+                    if slot != changed and word in words:
+                        domains[slot] = [w for w in words if w != word]
+                        if not domains[slot]:
+                            return False
+                        if slot not in queued:
+                            queue.append(slot)
+                            queued.add(slot)
+
+            for j, slot, i in self.crossings[changed]:
+                letters = set(word[j] for word in domains[changed])
+                words = domains[slot]
+                kept = [word for word in words if word[i] in letters]
+                if len(kept) < len(words):
+                    if not kept:
+                        return False
+                    domains[slot] = kept
+                    if slot not in queued:
+                        queue.append(slot)
+                        queued.add(slot)
+        return True
+
+
+    def _search(self, domains, limit, found):
+        """
+        Depth-first search over the consistent :domains:, guessing the open slot with the fewest words first.
+        Appends each complete assignment to :found: and stops once there are :limit: of them.
+        """
+        open_slots = [slot for slot, words in domains.items() if len(words) > 1]
+        if not open_slots:
+            found.append({slot: words[0] for slot, words in domains.items()})
+            return
+        slot = min(open_slots, key=lambda s: len(domains[s]))
+        for word in domains[slot]:
+            self.nodes += 1
+            guess = dict(domains)
+            guess[slot] = [word]
+            if self._propagate(guess, [slot]):
+                self._search(guess, limit, found)
+                if len(found) >= limit:
+                    return
+
+
+    def solve(self):
+        """
+        Solve every slot at once. Returns a dict of slot -> word if the board has exactly one solution, slot -> sorted list
+        of the words still possible after propagation if it has more than one (the board is underdetermined), or None if
+        it has none.
+        """
+        domains = dict(self.domains)
+        if not all(domains.values()):
+            return None # no word fits some slot - _propagate only notices domains it empties itself
+        if not self._propagate(domains, domains):
+            return None
+        found = []
+        self._search(domains, 2, found)
+        if not found:
+            return None
+        if len(found) == 1:
+            return found[0]
+        return {slot: sorted(words) for slot, words in domains.items()}
+
+
+if __name__ == "__main__":
+    from anagram_index import AnagramIndex
+
+    # a planted fill: SAT across the top, SIN down the left - the only words that fit the revealed S, A and N
+    index = AnagramIndex(["SAT", "SIT", "TAN", "ANT", "TIN", "NIT", "SIN"])
+    assert Board("SATIN", ["SA_", "_..", "N.."], index).solve() == {(0, 0, "across"): "SAT", (0, 0, "down"): "SIN"}
+    # a revealed letter that isn't on the wheel leaves the slot without words - no solution, rather than an error
+    assert Board("SATIN", ["_Q_"], index).solve() is None
+    print("ok")
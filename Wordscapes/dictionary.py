@@ -0,0 +1,143 @@
+""" Compile a word list into a compact, memory-mapped dictionary file, loaded once per process and shared by every Wordscapes. """
+import mmap
+import os
+import struct
+import sys
+import time
+from bisect import bisect_left
+from collections import Counter
+
+from anagram_index import AnagramIndex, letter_mask, signature
+
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "words.dict")
+
+MAGIC = b"WSDICT1\n"
+COUNT = struct.Struct("<I") # number of length buckets
+BUCKET = struct.Struct("<IQII") # word length, byte offset, records, distinct signatures
+
+_loaded = {} # path -> CompiledDictionary, shared by everything in the process
+
+
+def compile_words(words, path=DEFAULT_PATH):
+    """
+    Write :words: to the dictionary file at :path:, returning the number of words written.
+    Only all-letter A-Z words are kept, upper-cased. Capitalised entries (proper nouns, in most word lists) are skipped.
+    The file is the MAGIC line, a table of length buckets, then each bucket's records: fixed-width signature + word pairs of
+    2 x length bytes, sorted so anagrams sit together and any signature can be found with a binary search.
+    """
+    buckets = {}
+    for word in words:
+        word = word.strip()
+        if word and word == word.lower() and word.isascii() and word.isalpha():
+            word = word.upper()
+            buckets.setdefault(len(word), set()).add(signature(word) + word)
+
+    header = MAGIC + COUNT.pack(len(buckets))
+    offset = len(header) + BUCKET.size * len(buckets)
+    table, body = [], []
+    for length in sorted(buckets):
+        records = sorted(buckets[length])
+        signatures = len(set(record[:length] for record in records))
+        table.append(BUCKET.pack(length, offset, len(records), signatures))
+        body.append("".join(records).encode("ascii"))
+        offset += len(body[-1])
+
+    with open(path, "wb") as f:
+        f.write(header)
+        f.writelines(table)
+        f.writelines(body)
+    return sum(len(records) for records in buckets.values())
+
+
+class CompiledDictionary(AnagramIndex):
+    """
+    A read-only AnagramIndex over a file written by compile_words. The file is memory-mapped and only the bucket table is read
+    up front, so opening it takes well under a millisecond and the words themselves stay in the page cache.
+    """
+    def __init__(self, path=DEFAULT_PATH):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} isn't a compiled dictionary - build it with compile_words")
+        (count,) = COUNT.unpack_from(self._mm, len(MAGIC))
+        self._buckets = {} # length -> (offset, records, signatures)
+        self._patterns = {} # length -> positional postings, see AnagramIndex._postings
+        for i in range(count):
+            length, offset, records, signatures = BUCKET.unpack_from(self._mm, len(MAGIC) + COUNT.size + i*BUCKET.size)
+            self._buckets[length] = (offset, records, signatures)
+
+
+    def add(self, word):
+        raise TypeError("a compiled dictionary is read-only - recompile it with compile_words instead")
+
+
+    def __len__(self):
+        return sum(records for _, records, _ in self._buckets.values())
+
+
+    def _signature_count(self, length):
+        return self._buckets.get(length, (0, 0, 0))[2]
+
+
+    def _anagrams(self, length, sig):
+        if length not in self._buckets:
+            return ()
+        offset, records, _ = self._buckets[length]
+        mm, width = self._mm, 2 * length
+        key = lambda i: mm[offset + i*width:offset + i*width + length]
+        sig = sig.encode("ascii", errors="replace")
+        found = []
+        i = bisect_left(range(records), sig, key=key)
+        while i < records and key(i) == sig: # anagram groups are small, so walk them rather than search for the end
+            found.append(mm[offset + i*width + length:offset + (i+1)*width].decode("ascii"))
+            i += 1
+        return found
+
+
+    def _groups(self, length):
+        if length not in self._buckets:
+            return
+        offset, records, _ = self._buckets[length]
+        width = 2 * length
+        data = self._mm[offset:offset + records*width].decode("ascii")
+        sig, words = None, []
+        for i in range(0, len(data), width):
+            if data[i:i + length] != sig:
+                if words:
+                    yield sig, letter_mask(sig), max(Counter(sig).values()), words
+                sig, words = data[i:i + length], []
+            words.append(data[i + length:i + width])
+        if words:
+            yield sig, letter_mask(sig), max(Counter(sig).values()), words
+
+
+def load(path=DEFAULT_PATH):
+    """
+    The CompiledDictionary at :path:, opened the first time it's asked for and shared after that.
+    If the default file doesn't exist yet, it's compiled from the NLTK words corpus (see setup.py) on first use.
+    """
+    if path not in _loaded:
+        if path == DEFAULT_PATH and not os.path.exists(path):
+            try:
+                from nltk.corpus import words
+            except ModuleNotFoundError:
+                raise FileNotFoundError(f"No dictionary at {path} - compile one from a word list with `python dictionary.py WORDS_FILE`, or run the setup.py file") from None
+            compile_words(words.words(), path)
+        _loaded[path] = CompiledDictionary(path)
+    return _loaded[path]
+
+
+if __name__ == "__main__":
+    import argparse # only needed here - kept out of the imports Wordscapes pays for at startup
+
+    parser = argparse.ArgumentParser(description="Compile a plain word list (one word per line) into a Wordscapes dictionary file.")
+    parser.add_argument("words", help="word list to compile")
+    parser.add_argument("-o", "--output", default=DEFAULT_PATH, help=f"dictionary file to write (default: {DEFAULT_PATH})")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with open(args.words) as f:
+        written = compile_words(f, args.output)
+    elapsed = time.perf_counter() - start
+    print(f"Compiled {written:,} words into {args.output} ({os.path.getsize(args.output):,} bytes) in {elapsed:.2f}s", file=sys.stderr)
@@ -0,0 +1,136 @@
+"""
+A long-running Wordscapes query server - the dictionary is loaded once and recent answers are cached.
+Speaks JSON lines over a local TCP socket, or over stdin/stdout with --stdio. Each request is one JSON object per line:
+    {"bank": "NTSIA", "word": "__T", "found": ["ANT"]}    -> {"guesses": ["SIT", "TAT", ...]}
+    {"op": "stats"}                                        -> {"requests": ..., "hit_rate": ..., "p50_ms": ..., "p99_ms": ...}
+Malformed requests get {"error": "..."} back, and the connection stays open - except for a line over 64 KiB, which gets an
+error and then the connection is closed.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import OrderedDict, deque
+
+import dictionary
+from anagram_index import signature
+from wordscapes import Wordscapes
+
+
+class QueryServer():
+    """
+    Answers guess queries against one shared dictionary, with a bounded LRU cache of :cache_size: answers keyed by the
+    normalized query - the bank's letters sorted, the template and the found words upper-cased, and the found words sorted.
+    The latencies of the last :window: requests (from the parsed request to the encoded reply) are kept for the stats.
+    """
+    def __init__(self, words, cache_size=10000, window=10000):
+        self.words = words
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.hits = 0
+
+
+    def guess(self, bank, word, found=()):
+        """ The guesses for :bank: and the :word: template, leaving out the :found: words - from the cache when possible """
+        key = (signature(bank), word.upper(), tuple(sorted(f.strip().upper() for f in found)))
+        guesses = self.cache.get(key)
+        if guesses is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return guesses
+        guesses = Wordscapes(bank, word=word, found=",".join(found), words=self.words).guess()
+        self.cache[key] = guesses
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False) # the least recently used
+        return guesses
+
+
+    def stats(self):
+        """ Request count, cache hit rate and latency percentiles (in milliseconds) over the recent window """
+        latencies = sorted(self.latencies)
+        percentile = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000 if latencies else 0.0
+        return {
+            "requests": self.requests,
+            "cache_size": len(self.cache),
+            "hit_rate": self.hits / self.requests if self.requests else 0.0,
+            "p50_ms": percentile(0.50),
+            "p99_ms": percentile(0.99),
+        }
+
+
+    def handle(self, line):
+        """ Answer one request :line: (bytes or str of JSON), returning the reply line as bytes """
+        start = time.perf_counter()
+        try:
+            request = json.loads(line)
+            if request.get("op", "guess") == "stats":
+                return (json.dumps(self.stats()) + "\n").encode()
+            found = request.get("found", [])
+            if isinstance(found, str):
+                found = [f for f in found.split(",") if f.strip()] # the csv form the Wordscapes class takes
+            reply = {"guesses": self.guess(request["bank"], request["word"], found)}
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            reply = {"error": f"bad request: {error!r}"}
+        data = (json.dumps(reply) + "\n").encode()
+        self.requests += 1
+        self.latencies.append(time.perf_counter() - start)
+        return data
+
+
+    async def _serve_client(self, reader, writer):
+        """ Answer each line from one client until it disconnects """
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError): # a line over the reader's 64 KiB limit
+                    # the rest of the line would arrive looking like the next request, so answer once and hang up
+                    writer.write((json.dumps({"error": "request line too long"}) + "\n").encode())
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    writer.write(self.handle(line))
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+    async def serve_tcp(self, host="127.0.0.1", port=8765):
+        """ Serve any number of concurrent clients on :host:, :port: until cancelled """
+        server = await asyncio.start_server(self._serve_client, host, port)
+        print(f"Serving Wordscapes queries on {host}:{port}", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+
+    async def serve_stdio(self):
+        """ Answer requests from stdin on stdout until stdin closes """
+        # lines are read on a thread rather than through connect_read_pipe, which only takes pipes - not a file redirected to stdin
+        loop = asyncio.get_running_loop()
+        while line := await loop.run_in_executor(None, sys.stdin.buffer.readline):
+            if line.strip():
+                sys.stdout.buffer.write(self.handle(line))
+                sys.stdout.buffer.flush()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve Wordscapes guess queries as JSON lines, with the dictionary kept warm.")
+    parser.add_argument("--stdio", action="store_true", help="read requests from stdin and reply on stdout instead of a socket")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on (default: 8765)")
+    parser.add_argument("--cache-size", type=int, default=10000, help="number of answers to keep in the LRU cache")
+    parser.add_argument("--dictionary", default=dictionary.DEFAULT_PATH, help="compiled dictionary file (see dictionary.py)")
+    args = parser.parse_args()
+
+    server = QueryServer(dictionary.load(args.dictionary), cache_size=args.cache_size)
+    try:
+        asyncio.run(server.serve_stdio() if args.stdio else server.serve_tcp(args.host, args.port))
+    except KeyboardInterrupt:
+        print(json.dumps(server.stats()), file=sys.stderr)
@@ -8,4 +8,10 @@ except AttributeError:
 else:
     ssl._create_default_https_context = _create_unverified_https_context
 
-nltk.download("words")
\ No newline at end of file
+nltk.download("words")
+
+# compile the corpus into the dictionary file Wordscapes loads, so it never needs the network (or nltk) again
+from nltk.corpus import words
+import dictionary
+
+dictionary.compile_words(words.words())
\ No newline at end of file
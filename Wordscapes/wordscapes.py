@@ -1,58 +1,40 @@
-from itertools import permutations
-from collections import Counter
-
-try:
-    from nltk.corpus import words
-except ModuleNotFoundError:
-    print("!! Module not found. Please run the setup.py file.")
+import dictionary
+from board import Board
 
 
 class Wordscapes():
     """ Simple class to provided guesses for the hidden word """
-    def __init__(self, bank, word=None, found=None):
+    def __init__(self, bank, word=None, found=None, words=None):
         self.bank = list(bank.upper())
         if word:
             self.word = list(word.upper())
-        if found:
-            self.found = [x.strip() for x in list(found.upper().split(","))]
-        self.dictionary = set(words.words())
+        self.found = [x.strip() for x in list(found.upper().split(","))] if found else []
+        self.dictionary = words if words is not None else dictionary.load() # compiled once, then shared by every instance
 
 
     def _is_word(self, word):
         """ """
-        return True if word.lower() in self.dictionary else False
+        return word in self.dictionary
     
 
     def guess(self):
-        """ Create a list of 'valid' guesses. """
+        """
+        Create a sorted list of 'valid' guesses, each word once.
+        Rather than trying every permutation of the bank, the dictionary's index hands back the words that fit the hard-coded
+        characters and that the bank's letters can spell.
+        """
         guesses = []
-        char_indexes = dict([(i,l) for i,l in enumerate(self.word) if l != "_"])
-        for p in permutations(self.bank, len(self.word)):
-            guess = "".join(p)
-            
-            # ensure this permutation hasn't already been found
-            if hasattr(self, found) and guess in self.found:
+        for guess in self.dictionary.match("".join(self.word), "".join(self.bank)):
+            # ensure this word hasn't already been found
+            if guess in self.found:
                 continue
             
-            # ensure this permutation has at least one vowel
-            if not any(v in p for v in list("AEIOU")):
-                continue
-
-            # ensure this permutation has at least one consanent
-            if not any(v in p for v in list("BCDFGHJKLMNPQRSTVWXYZ")):
+            # ensure this word has at least one vowel
+            if not any(v in guess for v in list("AEIOU")):
                 continue
 
-            # ensure the hard-coded characters are in place for this permutation
-            skip = False
-            for k,v in char_indexes.items():
-                if p[k] != v:
-                    skip = True
-                    break
-            if skip:
-                continue
-
-            # see if the guess is a valid word
-            if not self._is_word(guess):
+            # ensure this word has at least one consanent
+            if not any(v in guess for v in list("BCDFGHJKLMNPQRSTVWXYZ")):
                 continue
 
             guesses.append(guess)
@@ -60,6 +42,14 @@ class Wordscapes():
         return guesses
 
 
+    def solve_board(self, grid):
+        """
+        Solve a whole level - :grid: is the level's crossword (see Board) and the bank is its wheel.
+        Returns each slot's word, or the candidates left for each slot if more than one answer fits (see Board.solve).
+        """
+        return Board("".join(self.bank), grid, self.dictionary).solve()
+
+
 if __name__ == "__main__":
     bank = "NTSIA" # given word bank
     word = "__T" # word to guess. Use _ for blanks